@@ -2,6 +2,8 @@
 from django.contrib import admin
 
 # Local
+from .models import Change
+from .models import Checkpoint
 from .models import Group
 from .models import Person
 
@@ -36,6 +38,60 @@ class ReadOnlyAdmin(admin.ModelAdmin):
         return super().changeform_view(request, object_id, extra_context=extra_context)
 
 
+@admin.register(Change)
+class ChangeAdmin(ReadOnlyAdmin):
+    fields = [
+        'seq',
+        'resource',
+        'object_id',
+        'action',
+        'created',
+    ]
+
+    list_display = [
+        'seq',
+        'resource',
+        'object_id',
+        'action',
+        'created',
+    ]
+
+    list_filter = [
+        'resource',
+        'action',
+    ]
+
+    readonly_fields = [
+        'seq',
+        'resource',
+        'object_id',
+        'action',
+        'created',
+    ]
+
+
+@admin.register(Checkpoint)
+class CheckpointAdmin(ReadOnlyAdmin):
+    fields = [
+        'source',
+        'cursor',
+        ('created', 'modified',),
+    ]
+
+    list_display = [
+        'source',
+        'cursor',
+        'modified',
+    ]
+
+    readonly_fields = [
+        'source',
+        'cursor',
+        'created',
+        'modified',
+    ]
+
+
 @admin.register(Group)
 class GroupAdmin(DjangoObjectActions, ReadOnlyAdmin):
     save_on_top = True
@@ -0,0 +1,53 @@
+# Standard Library
+import hashlib
+
+# Django
+from django.core.cache import cache
+
+
+# Cached responses also expire on their own, in case an invalidation is missed.
+RESPONSE_TIMEOUT = 60 * 15
+
+RESOURCES = [
+    'group',
+    'person',
+]
+
+
+def get_generation_key(resource):
+    return 'bhs:generation:{0}'.format(resource)
+
+
+def get_generation(resource):
+    return cache.get_or_set(get_generation_key(resource), 1, None)
+
+
+def invalidate(*resources):
+    """Orphan every cached response for `resources`, or for all of them.
+
+    Bumping the generation changes every response key at once; the old
+    entries are left to expire.
+    """
+    for resource in resources or RESOURCES:
+        key = get_generation_key(resource)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, None)
+
+
+def get_response_key(resource, tier, request, version=''):
+    params = sorted(
+        (key, value)
+        for key in request.query_params
+        for value in request.query_params.getlist(key)
+    )
+    digest = hashlib.sha1(
+        "{0}?{1}|{2}".format(request.path, params, version).encode(),
+    ).hexdigest()
+    return 'bhs:response:{0}:{1}:{2}:{3}'.format(
+        resource,
+        get_generation(resource),
+        tier,
+        digest,
+    )
@@ -7,4 +7,4 @@ class BhsConfig(AppConfig):
     verbose_name = 'BHS Member Center'
 
     def ready(self):
-        return
+        from . import signals  # noqa: F401
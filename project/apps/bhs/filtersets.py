@@ -2,10 +2,24 @@
 from django_filters.rest_framework import FilterSet
 
 # Local
+from .models import Change
 from .models import Group
 from .models import Person
 
 
+class ChangeFilterset(FilterSet):
+    class Meta:
+        model = Change
+        fields = {
+            'seq': [
+                'gt',
+            ],
+            'resource': [
+                'exact',
+            ],
+        }
+
+
 class GroupFilterset(FilterSet):
     class Meta:
         model = Group
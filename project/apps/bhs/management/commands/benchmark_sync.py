@@ -0,0 +1,205 @@
+# Standard Library
+import datetime
+import random
+import time
+import uuid
+
+# Django
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db import transaction
+
+
+PARTS = ['tenor', 'lead', 'baritone', 'bass', None]
+KINDS = ['quartet', 'chorus', 'chapter', 'group']
+DISTRICTS = ['CAR', 'DIX', 'EVG', 'FWD', 'JAD', 'LOL', 'MAD', 'NED', 'SUN', 'SWD']
+
+
+def make_date(rng, start=1950, end=2030):
+    return datetime.date(rng.randint(start, end), rng.randint(1, 12), rng.randint(1, 28))
+
+
+def make_phone(rng):
+    return "({0}) {1}-{2:04d}".format(rng.randint(201, 989), rng.randint(200, 999), rng.randint(0, 9999))
+
+
+def make_structures(rng, size):
+    structures = []
+    for i in range(size):
+        kind = rng.choice(KINDS)
+        structures.append({
+            'id': str(uuid.UUID(int=rng.getrandbits(128))),
+            'name': "{0} {1}".format(kind.title(), i),
+            'kind': kind,
+            'gender': rng.choice(['men', 'women', 'mixed']),
+            'division': None,
+            'bhs_id': 100000 + i,
+            'chapter_code': "{0}{1:03d}".format(rng.choice('ABCDEFGHJ'), i % 1000),
+            'website': rng.choice(["www.example{0}.org".format(i), '', None]),
+            'email': rng.choice(["group{0}@example.com".format(i), 'not an email', None]),
+            'phone': make_phone(rng),
+            'fax': None,
+            'facebook': rng.choice(["https://facebook.com/group{0}".format(i), None]),
+            'twitter': None,
+            'youtube': None,
+            'pinterest': None,
+            'flickr': None,
+            'instagram': None,
+            'soundcloud': None,
+            'preferred_name': rng.choice(["Group {0}".format(i), None]),
+            'visitor_information': None,
+            'established_date': make_date(rng, 1938, 2019),
+            'district': rng.choice(DISTRICTS),
+            'status_real': rng.choice([10, 10, 10, -10]),
+        })
+    return structures
+
+
+def make_humans(rng, size):
+    humans = []
+    for i in range(size):
+        humans.append({
+            'id': str(uuid.UUID(int=rng.getrandbits(128))),
+            'first_name': rng.choice(["Jim", "Dr. Bob", "Pat", "Sam"]),
+            'middle_name': rng.choice(["Lee", None]),
+            'last_name': rng.choice(["Smith", "Jones II", "Brown Jr", "Miller"]),
+            'nick_name': rng.choice(["Jimmy", None]),
+            'email': "person{0}@example.com".format(i) if rng.random() < 0.8 else None,
+            'birth_date': make_date(rng, 1930, 2005),
+            'home_phone': make_phone(rng),
+            'cell_phone': rng.choice([make_phone(rng), None]),
+            'work_phone': None,
+            'bhs_id': 200000 + i,
+            'gender': rng.choice(['male', 'female']),
+            'part': rng.choice(PARTS),
+            'mon': rng.randint(0, 600),
+            'is_deceased': False,
+            'is_honorary': False,
+            'is_suspended': False,
+            'is_expelled': False,
+            'status': rng.choice([10, 10, -10]),
+            'current_through': make_date(rng, 2015, 2030),
+        })
+    return humans
+
+
+def make_roles(rng, structures, humans):
+    roles = []
+    for i, human in enumerate(humans):
+        structure = structures[i % len(structures)]
+        end_date = rng.choice([make_date(rng, 2015, 2030), None])
+        roles.append({
+            'id': str(uuid.UUID(int=rng.getrandbits(128))),
+            'name': rng.choice(["President", "Secretary", "Treasurer"]),
+            'structure_id': structure['id'],
+            'human_id': human['id'],
+            'startest_date': make_date(rng, 1990, 2019),
+            'endest_date': end_date,
+            'status': 10 if end_date is None or end_date >= datetime.date.today() else -10,
+        })
+    return roles
+
+
+def make_joins(rng, structures, humans):
+    joins = []
+    for i, human in enumerate(humans):
+        structure = structures[(i * 7) % len(structures)]
+        end_date = rng.choice([make_date(rng, 2015, 2030), None])
+        joins.append({
+            'structure__id': structure['id'],
+            'subscription__human__id': human['id'],
+            'id': str(uuid.UUID(int=rng.getrandbits(128))),
+            'vocal_part': rng.choice(['Tenor', 'Lead', 'Baritone', 'Bass', '', None]),
+            'startest_date': make_date(rng, 1990, 2019),
+            'endest_date': end_date,
+            'status': 10 if end_date is None or end_date >= datetime.date.today() else -10,
+        })
+    return joins
+
+
+class QueryCounter(object):
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class Command(BaseCommand):
+    help = "Time the sync managers against synthetic source rows."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes',
+            type=int,
+            nargs='+',
+            dest='sizes',
+            default=[1000, 10000, 100000],
+            help='Numbers of rows to sync per entity.',
+        )
+
+        parser.add_argument(
+            '--batch',
+            action='store_true',
+            dest='batch',
+            help='Time the batch methods instead of the single-row ones.',
+        )
+
+        parser.add_argument(
+            '--seed',
+            type=int,
+            dest='seed',
+            default=0,
+            help='Seed for the synthetic data.',
+        )
+
+    def handle(self, *args, **options):
+        Group = apps.get_model('bhs.group')
+        Person = apps.get_model('bhs.person')
+        Officer = apps.get_model('bhs.officer')
+        Member = apps.get_model('bhs.member')
+        rng = random.Random(options['seed'])
+
+        self.stdout.write("{0:>8} {1:<10} {2:<8} {3:>10} {4:>12} {5:>12}".format(
+            'rows', 'entity', 'pass', 'seconds', 'rows/sec', 'queries/row',
+        ))
+        for size in options['sizes']:
+            structures = make_structures(rng, max(size // 10, 1))
+            humans = make_humans(rng, size)
+            entities = [
+                ('structure', Group.objects.update_or_create_from_structure, Group.objects.update_or_create_from_structures, structures),
+                ('human', Person.objects.update_or_create_from_human, Person.objects.update_or_create_from_humans, humans),
+                ('role', Officer.objects.update_or_create_from_role, Officer.objects.update_or_create_from_roles, make_roles(rng, structures, humans)),
+                ('join', Member.objects.update_or_create_from_join, Member.objects.update_or_create_from_joins, make_joins(rng, structures, humans)),
+            ]
+            # Everything is rolled back, so each size starts from the
+            # same database.
+            with transaction.atomic():
+                # The second pass finds every row unchanged.
+                for label in ['create', 'resync']:
+                    for entity, single, batch, rows in entities:
+                        self.time(size, entity, label, single, batch, rows, options['batch'])
+                transaction.set_rollback(True)
+        self.stdout.write("Complete.")
+
+    def time(self, size, entity, label, single, batch, rows, use_batch):
+        counter = QueryCounter()
+        with connection.execute_wrapper(counter):
+            started = time.perf_counter()
+            if use_batch:
+                for i in range(0, len(rows), 1000):
+                    batch(rows[i:i + 1000])
+            else:
+                for row in rows:
+                    single(row)
+            elapsed = time.perf_counter() - started
+        self.stdout.write("{0:>8} {1:<10} {2:<8} {3:>10.2f} {4:>12.0f} {5:>12.2f}".format(
+            size,
+            entity,
+            label,
+            elapsed,
+            len(rows) / elapsed if elapsed else 0.0,
+            counter.count / len(rows),
+        ))
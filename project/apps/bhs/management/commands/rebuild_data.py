@@ -1,5 +1,4 @@
 
-
 # Standard Library
 # import datetime
 import logging
@@ -9,15 +8,33 @@ from django.apps import apps
 from django.core.management.base import BaseCommand
 # from django.contrib.auth import get_user_model
 
+# First-Party
+from apps.bhs.caching import invalidate
+from apps.source.managers import chunks
 
-log = logging.getLogger('updater')
 
-# from apps.bhs.tasks import create_or_update_member_from_join
+log = logging.getLogger('updater')
 
 
 class Command(BaseCommand):
     help = "Nightly rebuild."
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            dest='batch_size',
+            default=1000,
+            help='Number of Members to upsert per chunk.',
+        )
+
+        parser.add_argument(
+            '--restart',
+            action='store_true',
+            dest='restart',
+            help='Ignore the resume token of an interrupted run.',
+        )
+
     def handle(self, *args, **options):
         Group = apps.get_model('bhs.group')
         self.stdout.write("Rebuilding Group tree sort...")
@@ -25,23 +42,35 @@ class Command(BaseCommand):
         # Award = apps.get_model('bhs.award')
         # Award.objects.sort_tree()
 
-        # Join = apps.get_model('source.join')
-        # # Sync Members
-        # self.stdout.write("Fetching Joins from Source Database...")
-        # joins = Join.objects.export_values(cursor=None)
-        # t = len(joins)
-        # i = 0
-        # for join in joins:
-        #     i += 1
-        #     self.stdout.flush()
-        #     self.stdout.write("Updating {0} of {1} Members...".format(i, t), ending='\r')
-        #     create_or_update_member_from_join.delay(join)
-        # self.stdout.write("")
-        # self.stdout.write("Updated {0} Members.".format(t))
+        Join = apps.get_model('source.join')
+        Member = apps.get_model('bhs.member')
+        Checkpoint = apps.get_model('bhs.checkpoint')
+        # Sync Members, recording the last (structure, human) pair loaded
+        # after every chunk so a crashed run picks up where it stopped.
+        token = '' if options['restart'] else Checkpoint.objects.get_token(Checkpoint.SOURCE.join)
+        after = token.split(':') if token else None
+        if after:
+            self.stdout.write("Resuming after {0}...".format(token))
+        self.stdout.write("Fetching Joins from Source Database...")
+        joins = Join.objects.export_reduced(after=after)
+        t = 0
+        for chunk in chunks(joins, options['batch_size']):
+            Member.objects.update_or_create_from_joins(chunk)
+            last = chunk[-1]
+            Checkpoint.objects.set_token(
+                Checkpoint.SOURCE.join,
+                "{0}:{1}".format(last['structure__id'], last['subscription__human__id']),
+            )
+            t += len(chunk)
+            self.stdout.flush()
+            self.stdout.write("Updating {0} Members...".format(t), ending='\r')
+        Checkpoint.objects.set_token(Checkpoint.SOURCE.join, '')
+        self.stdout.write("")
+        self.stdout.write("Updated {0} Members.".format(t))
         # Delete Orphans
-        # self.stdout.write("Deleting orphans...")
-        # joins = list(Join.objects.values_list('id', flat=True))
-        # t = Member.objects.delete_orphans(joins)
-        # self.stdout.write("Deleted {0} Member orphans.".format(t)
+        self.stdout.write("Deleting Member orphans...")
+        t = Member.objects.delete_orphans(Join.objects.export_ids())
+        self.stdout.write("Deleted {0} Member orphans.".format(t))
+        invalidate()
         self.stdout.write("Complete.")
         return
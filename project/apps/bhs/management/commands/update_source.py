@@ -2,11 +2,14 @@
 # Standard Library
 import datetime
 import logging
+import multiprocessing
+from collections import Counter
 
 # Django
 from django.apps import apps
 from django.contrib.auth import get_user_model
 from django.core.management.base import BaseCommand
+from django.db import connections
 from django.utils import timezone
 
 User = get_user_model()
@@ -15,6 +18,7 @@ Person = apps.get_model('bhs.person')
 Group = apps.get_model('bhs.group')
 Officer = apps.get_model('bhs.officer')
 Member = apps.get_model('bhs.member')
+Checkpoint = apps.get_model('bhs.checkpoint')
 
 Human = apps.get_model('source.human')
 Structure = apps.get_model('source.structure')
@@ -22,12 +26,67 @@ Role = apps.get_model('source.role')
 Subscription = apps.get_model('source.subscription')
 Join = apps.get_model('source.join')
 
-from apps.bhs.tasks import create_or_update_person_from_human
-from apps.bhs.tasks import create_or_update_officer_from_role
-from apps.bhs.tasks import create_or_update_group_from_structure
+from apps.bhs.caching import invalidate
+from apps.bhs.metrics import SyncMetrics
+from apps.bhs.scheduler import SYNCS
+from apps.bhs.scheduler import SyncScheduler
+from apps.bhs.tasks import update_group_owners
+from apps.bhs.tasks import update_person_owners
 
 log = logging.getLogger('updater')
 
+# Source -> (source model, field its rows are partitioned on)
+PARTITIONS = {
+    'human': (Human, 'id'),
+    'structure': (Structure, 'id'),
+    'role': (Role, 'human_id'),
+    'join': (Join, 'subscription__human__id'),
+}
+
+# Source -> (local model, source field naming the rows whose owners change)
+OWNERS = {
+    'human': ('bhs.person', 'id'),
+    'role': ('bhs.group', 'structure_id'),
+}
+
+PHASES = [
+    ['human', 'structure'],
+    ['role'],
+    ['join'],
+]
+
+
+def get_bounds(workers):
+    """Split the id space into `workers` ranges on the leading hex digits."""
+    workers = min(workers, 256)
+    edges = [
+        '{0:02x}'.format(i * 256 // workers)
+        for i in range(1, workers)
+    ]
+    return list(zip([None] + edges, edges + [None]))
+
+
+def sync_partition(source, cursor, bounds, size):
+    """Export, transform and load one partition of a source.
+
+    Runs in a worker process with its own database connections.
+    """
+    model, field = PARTITIONS[source]
+    label, method, _ = SYNCS[source]
+    manager = apps.get_model(label).objects
+    metrics = SyncMetrics()
+    touched = set()
+    pages = model.objects.export_pages(cursor=cursor, size=size, bounds=(field,) + bounds)
+    for rows in metrics.pages(source, pages):
+        metrics.update(source, getattr(manager, method)(rows))
+        if source in OWNERS:
+            touched.update(row[OWNERS[source][1]] for row in rows)
+    return source, metrics.get(source), touched
+
+
+def update_owners(label, pks):
+    return apps.get_model(label).objects.update_owners(pks)
+
 
 class Command(BaseCommand):
     help = "Command to sync with BHS database."
@@ -60,6 +119,34 @@ class Command(BaseCommand):
             help='Number of hours to update.',
         )
 
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            dest='batch_size',
+            default=1000,
+            help='Number of rows to sync per job.',
+        )
+
+        parser.add_argument(
+            '--since-last',
+            action='store_true',
+            dest='since_last',
+            help='Resume from the last recorded checkpoint.',
+        )
+
+        parser.add_argument(
+            '--workers',
+            type=int,
+            dest='workers',
+            help='Sync in this many processes instead of through the queue.',
+        )
+
+        parser.add_argument(
+            '--record',
+            dest='record',
+            help='Write the run metrics as JSON to this path.',
+        )
+
     def handle(self, *args, **options):
         # Set Cursor
         if options['days']:
@@ -71,57 +158,213 @@ class Command(BaseCommand):
         else:
             cursor = None
 
-        # Sync Persons
+        # A windowed run may leave gaps, so only full and resumed
+        # runs are allowed to advance the checkpoints.
+        if options['since_last']:
+            cursors = {
+                source: Checkpoint.objects.get_cursor(source)
+                for source, _ in Checkpoint.SOURCE
+            }
+        else:
+            cursors = {
+                source: cursor
+                for source, _ in Checkpoint.SOURCE
+            }
+        checkpoint = options['since_last'] or not cursor
+        metrics = SyncMetrics()
+        if options['workers']:
+            return self.handle_workers(cursors, checkpoint, metrics, options)
+
+        # Each phase waits for the one before it, so Officers and Members
+        # never run ahead of the Persons and Groups they point at.
+        scheduler = SyncScheduler()
+        batch_size = options['batch_size']
+        persons = set()
+        groups = set()
+
+        # Sync Persons and Groups
         self.stdout.write("Fetching Humans from Source Database...")
-        humans = Human.objects.export_values(cursor=cursor)
-        t = len(humans)
-        i = 0
-        for human in humans:
-            i += 1
+        marks = {
+            'human': Human.objects.get_high_water_mark(),
+            'structure': Structure.objects.get_high_water_mark(),
+        }
+        t = 0
+        for humans in metrics.pages('human', Human.objects.export_pages(cursor=cursors['human'], size=batch_size)):
+            t += len(humans)
             self.stdout.flush()
-            self.stdout.write("Updating {0} of {1} Persons...".format(i, t), ending='\r')
-            create_or_update_person_from_human.delay(human)
+            self.stdout.write("Updating {0} Persons...".format(t), ending='\r')
+            scheduler.enqueue('human', humans)
+            persons.update(human['id'] for human in humans)
         self.stdout.write("")
-        self.stdout.write("Updated {0} Persons.".format(t))
-        # # if not cursor:
-        # #     humans = list(Human.objects.values_list('id', flat=True))
-        # #     self.stdout.write("Deleting Person orphans...")
-        # #     t = Person.objects.delete_orphans(humans)
-        # #     self.stdout.write("Deleted {0} Person orphans.".format(t))
-
-        # # Sync Groups
+        self.stdout.write("Queued {0} Persons.".format(t))
         self.stdout.write("Fetching Structures from Source Database...")
-        structures = Structure.objects.export_values(cursor=cursor)
-        t = len(structures)
-        i = 0
-        for structure in structures:
-            i += 1
+        t = 0
+        for structures in metrics.pages('structure', Structure.objects.export_pages(cursor=cursors['structure'], size=batch_size)):
+            t += len(structures)
             self.stdout.flush()
-            self.stdout.write("Updating {0} of {1} Groups...".format(i, t), ending='\r')
-            create_or_update_group_from_structure.delay(structure)
+            self.stdout.write("Updating {0} Groups...".format(t), ending='\r')
+            scheduler.enqueue('structure', structures)
         self.stdout.write("")
-        self.stdout.write("Updated {0} Groups.".format(t))
-        # if not cursor:
-        #     self.stdout.write("Deleting Orphans...")
-        #     structures = list(Structure.objects.values_list('id', flat=True))
-        #     t = Group.objects.delete_orphans(structures)
-        #     self.stdout.write("Deleted {0} Group orphans.".format(t))
+        self.stdout.write("Queued {0} Groups.".format(t))
+        failed = self.wait(scheduler, metrics)
+        if checkpoint:
+            self.advance('human', marks['human'], failed, metrics, scheduler)
+            self.advance('structure', marks['structure'], failed, metrics, scheduler)
+        if not cursors['human']:
+            self.stdout.write("Deleting Person orphans...")
+            t = Person.objects.delete_orphans(Human.objects.export_ids())
+            self.stdout.write("Deleted {0} Person orphans.".format(t))
+        if not cursors['structure']:
+            self.stdout.write("Deleting Group orphans...")
+            t = Group.objects.delete_orphans(Structure.objects.export_ids())
+            self.stdout.write("Deleted {0} Group orphans.".format(t))
 
         # Sync Officers
         self.stdout.write("Fetching Roles from Source Database...")
-        roles = Role.objects.export_values(cursor=cursor)
-        t = len(roles)
-        i = 0
-        for role in roles:
-            i += 1
+        mark = Role.objects.get_high_water_mark()
+        t = 0
+        for roles in metrics.pages('role', Role.objects.export_pages(cursor=cursors['role'], size=batch_size)):
+            t += len(roles)
             self.stdout.flush()
-            self.stdout.write("Updating {0} of {1} Officers...".format(i, t), ending='\r')
-            create_or_update_officer_from_role.delay(role)
+            self.stdout.write("Updating {0} Officers...".format(t), ending='\r')
+            scheduler.enqueue('role', roles)
+            groups.update(role['structure_id'] for role in roles)
         self.stdout.write("")
-        self.stdout.write("Updated {0} Officers.".format(t))
-        # if not cursor:
-        #     self.stdout.write("Deleting orphans...")
-        #     roles = list(Role.objects.values_list('id', flat=True))
-        #     t = Officer.objects.delete_orphans(roles)
-        #     self.stdout.write("Deleted {0} Officer orphans.".format(t))
+        self.stdout.write("Queued {0} Officers.".format(t))
+        failed = self.wait(scheduler, metrics)
+        if checkpoint:
+            self.advance('role', mark, failed, metrics, scheduler)
+        if not cursors['role']:
+            self.stdout.write("Deleting Officer orphans...")
+            t = Officer.objects.delete_orphans(Role.objects.export_ids())
+            self.stdout.write("Deleted {0} Officer orphans.".format(t))
+
+        # Sync Members; Joins are reduced per (structure, human) pair in
+        # one pass rather than through the grouped export query.
+        self.stdout.write("Fetching Joins from Source Database...")
+        mark = Join.objects.get_high_water_mark()
+        t = 0
+        for joins in metrics.pages('join', Join.objects.export_pages(cursor=cursors['join'], size=batch_size)):
+            t += len(joins)
+            self.stdout.flush()
+            self.stdout.write("Updating {0} Members...".format(t), ending='\r')
+            scheduler.enqueue('join', joins)
+        self.stdout.write("")
+        self.stdout.write("Queued {0} Members.".format(t))
+        failed = self.wait(scheduler, metrics)
+        if checkpoint:
+            self.advance('join', mark, failed, metrics, scheduler)
+
+        # Recompute Owners
+        self.stdout.write("Updating owners...")
+        pks = list(persons)
+        for i in range(0, len(pks), batch_size):
+            scheduler.add(update_person_owners.delay(pks[i:i + batch_size]))
+        pks = list(groups)
+        for i in range(0, len(pks), batch_size):
+            scheduler.add(update_group_owners.delay(pks[i:i + batch_size]))
+        self.wait(scheduler, metrics)
+        self.stdout.write("Updated owners for {0} Persons and {1} Groups.".format(len(persons), len(groups)))
+        self.finish(metrics, options)
         self.stdout.write("Complete.")
+
+    def wait(self, scheduler, metrics):
+        self.stdout.write("Waiting for jobs...")
+        failed = scheduler.barrier(metrics)
+        if failed:
+            self.stdout.write("{0} jobs failed.".format(sum(failed.values())))
+        return failed
+
+    def advance(self, source, mark, failed, metrics, scheduler=None):
+        """Move a source's checkpoint to `mark` if all of its rows synced.
+
+        Otherwise the old mark is kept, so the next `--since-last` run
+        exports the failed rows again.  Overlapping runs share staged
+        rows, so a failure recorded by any run's job since this one began
+        also keeps the mark.
+        """
+        failures = failed[source] + metrics.get(source)['failed']
+        if not failures and scheduler and scheduler.failed_since_start(source):
+            failures = 1
+        if failures:
+            log.error("Keeping the {0} checkpoint after {1} failures".format(source, failures))
+            self.stdout.write("Kept the {0} checkpoint after {1} failures.".format(source, failures))
+            return
+        Checkpoint.objects.set_cursor(source, mark)
+
+    def handle_workers(self, cursors, checkpoint, metrics, options):
+        batch_size = options['batch_size']
+        bounds = get_bounds(options['workers'])
+        touched = {label: set() for label, _ in OWNERS.values()}
+
+        # Forked workers must not share the parent's connections.
+        connections.close_all()
+        pool = multiprocessing.get_context('fork').Pool(len(bounds))
+        try:
+            for sources in PHASES:
+                marks = {
+                    source: PARTITIONS[source][0].objects.get_high_water_mark()
+                    for source in sources
+                }
+                self.stdout.write("Syncing {0} in {1} partitions...".format(
+                    ", ".join(sources),
+                    len(bounds),
+                ))
+                results = pool.starmap(sync_partition, [
+                    (source, cursors[source], partition, batch_size)
+                    for source in sources
+                    for partition in bounds
+                ])
+                for source, stats, pks in results:
+                    metrics.update(source, stats)
+                    if source in OWNERS:
+                        touched[OWNERS[source][0]].update(pks)
+                for source in sources:
+                    if checkpoint:
+                        self.advance(source, marks[source], Counter(), metrics)
+
+            # Recompute Owners
+            self.stdout.write("Updating owners...")
+            pool.starmap(update_owners, [
+                (label, pks[i:i + batch_size])
+                for label, pks in ((label, list(pks)) for label, pks in touched.items())
+                for i in range(0, len(pks), batch_size)
+            ])
+        finally:
+            pool.close()
+            pool.join()
+
+        if not cursors['human']:
+            self.stdout.write("Deleting Person orphans...")
+            t = Person.objects.delete_orphans(Human.objects.export_ids())
+            self.stdout.write("Deleted {0} Person orphans.".format(t))
+        if not cursors['structure']:
+            self.stdout.write("Deleting Group orphans...")
+            t = Group.objects.delete_orphans(Structure.objects.export_ids())
+            self.stdout.write("Deleted {0} Group orphans.".format(t))
+        if not cursors['role']:
+            self.stdout.write("Deleting Officer orphans...")
+            t = Officer.objects.delete_orphans(Role.objects.export_ids())
+            self.stdout.write("Deleted {0} Officer orphans.".format(t))
+
+        self.finish(metrics, options)
+        self.stdout.write("Complete.")
+
+    def finish(self, metrics, options):
+        # Bulk loads send no signals, so drop cached API responses here.
+        invalidate()
+        metrics.report()
+        for source, stats in metrics.entities.items():
+            self.stdout.write(
+                "{0}: {1} exported, {2} created, {3} updated, {4} unchanged, {5} failed.".format(
+                    source,
+                    stats['exported'],
+                    stats['created'],
+                    stats['updated'],
+                    stats['unchanged'],
+                    stats['failed'],
+                )
+            )
+        if options['record']:
+            metrics.write(options['record'])
+            self.stdout.write("Wrote run record to {0}.".format(options['record']))
@@ -1,3 +1,13 @@
+# Standard Library
+import hashlib
+import json
+import logging
+import time
+import uuid
+from collections import Counter
+from functools import wraps
+from itertools import chain
+
 # Third-Party
 # from algoliasearch_django.decorators import disable_auto_indexing
 from openpyxl import Workbook
@@ -9,14 +19,351 @@ from django.apps import apps
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
 from django.core.files.base import ContentFile
+from django.db import IntegrityError
+from django.db import connections
+from django.db import router
+from django.db import transaction
 from django.db.models import Manager
+from django.utils import timezone
 # from django.core.validators import validate_email
-from .validators import validate_url
-from .validators import validate_phone
-from .validators import validate_email
+from .caching import invalidate
+from .validators import get_cache_info
+from .transforms import normalize_human
+from .transforms import normalize_role
+from .transforms import normalize_roles
+from .transforms import normalize_join
+from .transforms import normalize_joins
+from .transforms import normalize_humans
+from .transforms import normalize_structure
+from .transforms import normalize_structures
 
 User = get_user_model()
 
+log = logging.getLogger('updater')
+
+
+def get_digest(defaults):
+    """Fingerprint the normalized values written by a sync."""
+    return hashlib.sha1(
+        json.dumps(defaults, sort_keys=True, default=str).encode()
+    ).hexdigest()
+
+
+def bulk_upsert(model, objs, conflict_fields, update_fields):
+    """Insert unsaved instances with a single INSERT ... ON CONFLICT DO UPDATE.
+
+    Only `update_fields` (plus `modified`) are overwritten on conflict, so
+    locally-edited columns are left alone.  Returns a `(pk, inserted)`
+    pair per affected row.
+    """
+    if not objs:
+        return []
+    opts = model._meta
+    connection = connections[router.db_for_write(model)]
+    qn = connection.ops.quote_name
+    fields = [f for f in opts.concrete_fields]
+    update_fields = list(update_fields) + ['modified']
+    rows = []
+    params = []
+    for obj in objs:
+        rows.append("({0})".format(", ".join(["%s"] * len(fields))))
+        params.extend(
+            f.get_db_prep_save(f.pre_save(obj, True), connection)
+            for f in fields
+        )
+    sql = "INSERT INTO {table} ({columns}) VALUES {rows} ON CONFLICT ({conflict}) DO UPDATE SET {updates} RETURNING {pk}, (xmax = 0)".format(
+        table=qn(opts.db_table),
+        pk=qn(opts.pk.column),
+        columns=", ".join(qn(f.column) for f in fields),
+        rows=", ".join(rows),
+        conflict=", ".join(qn(opts.get_field(f).column) for f in conflict_fields),
+        updates=", ".join(
+            "{0} = EXCLUDED.{0}".format(qn(opts.get_field(f).column))
+            for f in update_fields
+        ),
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [tuple(row) for row in cursor.fetchall()]
+
+
+def bulk_update_or_create(manager, defaults):
+    """Upsert a chunk of `{pk: defaults}` rows on the primary key.
+
+    Rows whose digest matches their own stored one are skipped.  Returns
+    the counts by outcome and the primary keys actually written.
+    """
+    Change = apps.get_model('bhs.change')
+    stats = Counter()
+    for values in defaults.values():
+        values['digest'] = get_digest(values)
+    digests = {
+        pk: digest
+        for pk, digest in manager.filter(
+            id__in=list(defaults),
+        ).values_list('id', 'digest')
+    }
+    for pk, values in list(defaults.items()):
+        if digests.get(uuid.UUID(str(pk))) == values['digest']:
+            del defaults[pk]
+            stats['unchanged'] += 1
+    if not defaults:
+        return stats, []
+
+    # Load with a single upsert; fall back to row-by-row on conflicts
+    # with other unique columns (eg, a reassigned bhs_id).
+    objs = [
+        manager.model(id=pk, **values)
+        for pk, values in defaults.items()
+    ]
+    fields = list(next(iter(defaults.values())))
+    pks = list(defaults)
+    try:
+        with transaction.atomic():
+            rows = bulk_upsert(manager.model, objs, ['id'], fields)
+            created = [pk for pk, inserted in rows if inserted]
+            updated = [pk for pk, inserted in rows if not inserted]
+            # Bulk writes send no signals, so record them for the feed.
+            Change.objects.record(manager.model, Change.ACTION.created, created)
+            Change.objects.record(manager.model, Change.ACTION.updated, updated)
+        stats['created'] = len(created)
+        stats['updated'] = len(updated)
+    except IntegrityError:
+        pks = []
+        for pk, values in defaults.items():
+            try:
+                with transaction.atomic():
+                    _, created = manager.update_or_create(
+                        id=pk,
+                        defaults=values,
+                    )
+            except IntegrityError:
+                stats['failed'] += 1
+                continue
+            pks.append(pk)
+            stats['created' if created else 'updated'] += 1
+    return stats, pks
+
+
+def timed(method):
+    """Record the wall time and validator cache use of a batch sync.
+
+    The method records its own `transform_time`; the rest is `load_time`.
+    The validator caches live as long as the worker, so only the hits and
+    misses during this batch are added, and the totals sum across jobs.
+    """
+    @wraps(method)
+    def wrapper(*args, **kwargs):
+        before = get_cache_info()
+        started = time.perf_counter()
+        stats = method(*args, **kwargs)
+        stats['load_time'] += time.perf_counter() - started - stats['transform_time']
+        after = get_cache_info()
+        for name, info in after.items():
+            stats['cache_hits'] += info['hits'] - before[name]['hits']
+            stats['cache_misses'] += info['misses'] - before[name]['misses']
+        return stats
+    return wrapper
+
+
+def resolve_keys(model, rows):
+    """Key a chunk of normalized rows on `(group_id, person_id)`.
+
+    The Persons and Groups referenced by the whole chunk are checked in
+    two queries; rows pointing at either that hasn't synced yet are
+    logged and dropped rather than raised on.  Returns the keyed rows
+    and the number dropped.
+    """
+    Person = apps.get_model('bhs.person')
+    Group = apps.get_model('bhs.group')
+    keyed = {}
+    for values in rows:
+        key = (
+            uuid.UUID(str(values.pop('group_id'))),
+            uuid.UUID(str(values.pop('person_id'))),
+        )
+        keyed[key] = values
+    groups = set(Group.objects.filter(
+        id__in={group_id for group_id, _ in keyed},
+    ).values_list('id', flat=True))
+    persons = set(Person.objects.filter(
+        id__in={person_id for _, person_id in keyed},
+    ).values_list('id', flat=True))
+    dangling = [
+        key for key in keyed
+        if key[0] not in groups or key[1] not in persons
+    ]
+    for group_id, person_id in dangling:
+        log.warning(
+            "Skipping %s for missing group %s or person %s",
+            model._meta.verbose_name,
+            group_id,
+            person_id,
+        )
+        del keyed[(group_id, person_id)]
+    return keyed, len(dangling)
+
+
+def find_orphans(local, source):
+    """Yield the pk of each local row whose key is missing from the source.
+
+    `local` yields `(key, pk)` and `source` yields keys, both sorted on the
+    key, so the two streams are merged in a single pass.
+    """
+    source = iter(source)
+    current = next(source, None)
+    for key, pk in local:
+        while current is not None and current < key:
+            current = next(source, None)
+        if current != key:
+            yield pk
+
+
+def delete_orphans(queryset, fields, keys, size=1000, collect=None):
+    """Delete rows of `queryset` whose `fields` no longer appear in `keys`.
+
+    `keys` is a stream of source key tuples sorted on the same fields.
+    Keys compare as UUIDs, which sort the same as the source's canonical
+    strings.  An empty source is treated as a failed export and deletes
+    nothing.  If given, `collect` is called with each chunk of pks just
+    before it is deleted.
+    """
+    source = (tuple(uuid.UUID(str(value)) for value in key) for key in keys)
+    first = next(source, None)
+    if first is None:
+        return 0
+    source = chain([first], source)
+    local = (
+        (row[:-1], row[-1]) for row in queryset.order_by(
+            *fields
+        ).values_list(
+            *fields,
+            'id',
+        ).iterator(chunk_size=size)
+    )
+    # Collect before deleting; the local stream is a live cursor.
+    orphans = list(find_orphans(local, source))
+    for i in range(0, len(orphans), size):
+        pks = orphans[i:i + size]
+        if collect:
+            collect(pks)
+        queryset.model.objects.filter(id__in=pks).delete()
+    return len(orphans)
+
+
+def update_group_owners(pks, size=1000):
+    """Recompute the owners of the given Groups, a chunk at a time."""
+    Group = apps.get_model('bhs.group')
+    pks = list(pks)
+    for i in range(0, len(pks), size):
+        Group.objects.update_owners(pks[i:i + size])
+
+
+def set_owners(manager, pks, owners):
+    """Replace `owners` for many rows given the wanted `(pk, user_id)` pairs.
+
+    Only the through rows that differ are touched, and only rows whose
+    owners changed get their `modified` bumped.
+    """
+    field = manager.model._meta.get_field('owners')
+    Through = field.remote_field.through
+    source = field.m2m_field_name() + '_id'
+    target = field.m2m_reverse_field_name() + '_id'
+    existing = {
+        (pk, user_id): through_id
+        for through_id, pk, user_id in Through.objects.filter(**{
+            source + '__in': pks,
+        }).values_list('id', source, target)
+    }
+    owners = set(owners)
+    removed = [
+        through_id
+        for pair, through_id in existing.items()
+        if pair not in owners
+    ]
+    added = [
+        Through(**{source: pk, target: user_id})
+        for pk, user_id in owners
+        if (pk, user_id) not in existing
+    ]
+    Through.objects.filter(id__in=removed).delete()
+    Through.objects.bulk_create(added)
+    changed = {pk for pk, _ in owners ^ set(existing)}
+    manager.filter(id__in=changed).update(modified=timezone.now())
+    Change = apps.get_model('bhs.change')
+    Change.objects.record(manager.model, Change.ACTION.updated, changed)
+    # The through rows are written directly, so no m2m_changed is sent.
+    if changed:
+        invalidate(manager.model._meta.model_name)
+    return len(changed)
+
+
+class ChangeManager(Manager):
+    # Any constant will do, as long as nothing else locks it.
+    lock_key = 0x6268734368616e67
+
+    def record(self, model, action, pks):
+        """Append one change per primary key, for the feed's resources only.
+
+        The writer takes a transaction-level advisory lock first, held
+        until its transaction ends, so sequence numbers are handed out in
+        commit order.  A reader therefore never sees a sequence number
+        while a lower one is still uncommitted, and a consumer that keeps
+        only the last sequence it saw never skips a change.  Every Change
+        must be written through here for that to hold.
+        """
+        resource = model._meta.model_name
+        if resource not in self.model.RESOURCE or not pks:
+            return []
+        using = router.db_for_write(self.model)
+        with transaction.atomic(using=using):
+            with connections[using].cursor() as cursor:
+                cursor.execute("SELECT pg_advisory_xact_lock(%s)", [self.lock_key])
+            return self.bulk_create([
+                self.model(
+                    resource=resource,
+                    object_id=pk,
+                    action=action,
+                )
+                for pk in pks
+            ])
+
+
+class CheckpointManager(Manager):
+    def get_cursor(self, source):
+        return self.filter(
+            source=source,
+        ).values_list(
+            'cursor',
+            flat=True,
+        ).first()
+
+    def get_token(self, source):
+        return self.filter(
+            source=source,
+        ).values_list(
+            'token',
+            flat=True,
+        ).first() or ''
+
+    def set_token(self, source, token):
+        checkpoint, _ = self.update_or_create(
+            source=source,
+            defaults={
+                'token': token,
+            },
+        )
+        return checkpoint
+
+    def set_cursor(self, source, cursor):
+        checkpoint, _ = self.update_or_create(
+            source=source,
+            defaults={
+                'cursor': cursor,
+            },
+        )
+        return checkpoint
+
 
 class GroupManager(Manager):
     def update_or_create_from_structure(self, structure):
@@ -24,244 +371,14 @@ class GroupManager(Manager):
         if not isinstance(structure, dict):
             raise ValueError("Must be dict")
         mc_pk = structure['id']
-        name = structure['name']
-        status = structure['status_real']
-        kind = structure['kind']
-        gender = structure['gender']
-        district = structure['district']
-        division = structure['division']
-        bhs_id = structure['bhs_id']
-        legacy_code = structure['chapter_code']
-        website = structure['website']
-        email = structure['email']
-        main_phone = structure['phone']
-        fax_phone = structure['fax']
-        facebook = structure['facebook']
-        twitter = structure['twitter']
-        youtube = structure['youtube']
-        pinterest = structure['pinterest']
-        flickr = structure['flickr']
-        instagram = structure['instagram']
-        soundcloud = structure['soundcloud']
-        preferred_name = structure['preferred_name']
-        visitor_information = structure['visitor_information']
-        established_date = structure['established_date']
-
-        # Re-construct dangling article
-        name = name.strip() if name else ""
-        parsed = name.partition(", The")
-        name = "The {0}".format(parsed[0]) if parsed[1] else parsed[0]
-
-        preferred_name = "{0} (NAME APPROVAL PENDING)".format(preferred_name.strip()) if preferred_name else ''
-        name = name if name else preferred_name
-
-        if not name:
-            name = "(UNKNOWN)"
-
-        # AIC
-        aic_map = {
-            503061: "Signature",
-            500983: "After Hours",
-            501972: "Main Street",
-            501329: "Forefront",
-            500922: "Instant Classic",
-            304772: "Musical Island Boys",
-            500000: "Masterpiece",
-            501150: "Ringmasters",
-            317293: "Old School",
-            286100: "Storm Front",
-            500035: "Crossroads",
-            297201: "OC Times",
-            299233: "Max Q",
-            302244: "Vocal Spectrum",
-            299608: "Realtime",
-            6158: "Gotcha!",
-            2496: "Power Play",
-            276016: "Four Voices",
-            5619: "Michigan Jake",
-            6738: "Platinum",
-            3525: "FRED",
-            5721: "Revival",
-            2079: "Yesteryear",
-            2163: "Nightlife",
-            4745: "Marquis",
-            3040: "Joker's Wild",
-            1259: "Gas House Gang",
-            2850: "Keepsake",
-            1623: "The Ritz",
-            3165: "Acoustix",
-            1686: "Second Edition",
-            492: "Chiefs of Staff",
-            1596: "Interstate Rivals",
-            1654: "Rural Route 4",
-            406: "The New Tradition",
-            1411: "Rapscallions",
-            1727: "Side Street Ramblers",
-            545: "Classic Collection",
-            490: "Chicago News",
-            329: "Boston Common",
-            4034: "Grandma's Boys",
-            318: "Bluegrass Student Union",
-            362: "Most Happy Fellows",
-            1590: "Innsiders",
-            1440: "Happiness Emporium",
-            1427: "Regents",
-            627: "Dealer's Choice",
-            1288: "Golden Staters",
-            1275: "Gentlemen's Agreement",
-            709: "Oriole Four",
-            711: "Mark IV",
-            2047: "Western Continentals",
-            1110: "Four Statesmen",
-            713: "Auto Towners",
-            715: "Four Renegades",
-            1729: "Sidewinders",
-            718: "Town and Country 4",
-            719: "Gala Lads",
-            1871: "The Suntones",
-            722: "Evans Quartet",
-            724: "Four Pitchikers",
-            726: "Gaynotes",
-            729: "Lads of Enchantment",
-            731: "Confederates",
-            732: "Four Hearsemen",
-            736: "The Orphans",
-            739: "Vikings",
-            743: "Four Teens",
-            746: "Schmitt Brothers",
-            748: "Buffalo Bills",
-            750: "Mid-States Four",
-            753: "Pittsburghers",
-            756: "Doctors of Harmony",
-            759: "Garden State Quartet",
-            761: "Misfits",
-            764: "Harmony Halls",
-            766: "Four Harmonizers",
-            770: "Elastic Four",
-            773: "Chord Busters",
-            775: "Flat Foot Four",
-            776: "Bartlsesville Barflies",
-        }
+        defaults = normalize_structure(structure)
 
-        # Overwrite status for AIC
-        if bhs_id in aic_map:
-            status = -5
-
-        # Overwrite name for AIC
-        name = aic_map.get(bhs_id, name)
-
-        kind_map = {
-            'quartet': self.model.KIND.quartet,
-            'chorus': self.model.KIND.chorus,
-            'chapter': self.model.KIND.chapter,
-            'group': self.model.KIND.noncomp,
-            'district': self.model.KIND.district,
-            'organization': self.model.KIND.international,
-        }
-        kind = kind_map.get(kind, None)
-
-        legacy_code = legacy_code if legacy_code else ""
-
-        gender_map = {
-            'men': self.model.GENDER.male,
-            'women': self.model.GENDER.female,
-            'mixed': self.model.GENDER.mixed,
-        }
-        gender = gender_map.get(gender, self.model.GENDER.male)
-
-        district_map = {
-            'BHS': self.model.DISTRICT.bhs,
-            'CAR': self.model.DISTRICT.car,
-            'CSD': self.model.DISTRICT.csd,
-            'DIX': self.model.DISTRICT.dix,
-            'EVG': self.model.DISTRICT.evg,
-            'FWD': self.model.DISTRICT.fwd,
-            'ILL': self.model.DISTRICT.ill,
-            'JAD': self.model.DISTRICT.jad,
-            'LOL': self.model.DISTRICT.lol,
-            'MAD': self.model.DISTRICT.mad,
-            'NED': self.model.DISTRICT.ned,
-            'NSC': self.model.DISTRICT.nsc,
-            'ONT': self.model.DISTRICT.ont,
-            'PIO': self.model.DISTRICT.pio,
-            'RMD': self.model.DISTRICT.rmd,
-            'SLD': self.model.DISTRICT.sld,
-            'SUN': self.model.DISTRICT.sun,
-            'SWD': self.model.DISTRICT.swd,
-        }
-        district = district_map.get(district, None)
-
-        division_map = {
-            'EVG Division I': self.model.DIVISION.evgd1,
-            'EVG Division II': self.model.DIVISION.evgd2,
-            'EVG Division III': self.model.DIVISION.evgd3,
-            'EVG Division IV': self.model.DIVISION.evgd4,
-            'EVG Division V': self.model.DIVISION.evgd5,
-            'FWD Arizona': self.model.DIVISION.fwdaz,
-            'FWD Northeast': self.model.DIVISION.fwdne,
-            'FWD Northwest': self.model.DIVISION.fwdnw,
-            'FWD Southeast': self.model.DIVISION.fwdse,
-            'FWD Southwest': self.model.DIVISION.fwdsw,
-            'LOL 10000 Lakes': self.model.DIVISION.lol10l,
-            'LOL Division One': self.model.DIVISION.lolone,
-            'LOL Northern Plains': self.model.DIVISION.lolnp,
-            'LOL Packerland': self.model.DIVISION.lolpkr,
-            'LOL Southwest': self.model.DIVISION.lolsw,
-            'MAD Central': self.model.DIVISION.madcen,
-            'MAD Northern': self.model.DIVISION.madnth,
-            'MAD Southern': self.model.DIVISION.madsth,
-            'NED Granite and Pine': self.model.DIVISION.nedgp,
-            'NED Mountain': self.model.DIVISION.nedmtn,
-            'NED Patriot': self.model.DIVISION.nedpat,
-            'NED Sunrise': self.model.DIVISION.nedsun,
-            'NED Yankee': self.model.DIVISION.nedyke,
-            'SWD Northeast': self.model.DIVISION.swdne,
-            'SWD Northwest': self.model.DIVISION.swdnw,
-            'SWD Southeast': self.model.DIVISION.swdse,
-            'SWD Southwest': self.model.DIVISION.swdsw,
-        }
-        division = division_map.get(division, None)
-
-        website = validate_url(website)
-        facebook = validate_url(facebook)
-        twitter = validate_url(twitter)
-        youtube = validate_url(youtube)
-        pinterest = validate_url(pinterest)
-        flickr = validate_url(flickr)
-        instagram = validate_url(instagram)
-        soundcloud = validate_url(soundcloud)
-
-        phone = validate_phone(main_phone)
-        fax_phone = validate_phone(fax_phone)
-
-        email = validate_email(email)
-
-        visitor_information = visitor_information.strip() if visitor_information else ''
-
-        defaults = {
-            'status': status,
-            'name': name,
-            'kind': kind,
-            'gender': gender,
-            'district': district,
-            'division': division,
-            'bhs_id': bhs_id,
-            'code': legacy_code,
-            'website': website,
-            'email': email,
-            'phone': phone,
-            'fax_phone': fax_phone,
-            'facebook': facebook,
-            'twitter': twitter,
-            'youtube': youtube,
-            'pinterest': pinterest,
-            'flickr': flickr,
-            'instagram': instagram,
-            'soundcloud': soundcloud,
-            'visitor_information': visitor_information,
-            'start_date': established_date,
-            # 'parent': parent,
-        }
+        # Skip unchanged
+        digest = get_digest(defaults)
+        group = self.filter(id=mc_pk, digest=digest).first()
+        if group:
+            return group, False
+        defaults['digest'] = digest
 
         # Load
         group, created = self.update_or_create(
@@ -270,31 +387,62 @@ class GroupManager(Manager):
         )
         return group, created
 
-    def delete_orphans(self, structures):
-        # Delete Orphans
-        orphans = self.filter(
-            id__isnull=False,
-        ).exclude(
-            id__in=structures,
+    @timed
+    def update_or_create_from_structures(self, structures):
+        started = time.perf_counter()
+        defaults = {}
+        for values in normalize_structures(structures):
+            defaults[values.pop('id')] = values
+        transform_time = time.perf_counter() - started
+        stats, _ = bulk_update_or_create(self, defaults)
+        stats['transform_time'] = transform_time
+        return stats
+
+    def update_owners(self, pks):
+        Officer = apps.get_model('bhs.officer')
+        pks = list(pks)
+        emails = Officer.objects.filter(
+            group_id__in=pks,
+            person__email__isnull=False,
+        ).values_list(
+            'group_id',
+            'person__email',
         )
-        t = orphans.count()
-        orphans.delete()
-        return t
+        users = {}
+        for user_id, email in User.objects.filter(
+            email__in={email for _, email in emails},
+        ).values_list('id', 'email'):
+            users.setdefault(email, []).append(user_id)
+        owners = [
+            (group_id, user_id)
+            for group_id, email in emails
+            for user_id in users.get(email, [])
+        ]
+        return set_owners(self, pks, owners)
+
+    def delete_orphans(self, structures):
+        return delete_orphans(self.all(), ['id'], structures)
 
     def sort_tree(self):
-        self.all().update(tree_sort=None)
-        root = self.get(kind=self.model.KIND.international)
+        # Walk the tree in memory; later positions win, as they did when
+        # each row was saved in turn.
+        positions = {}
+        root = self.values_list(
+            'id',
+            flat=True,
+        ).get(kind=self.model.KIND.international)
         i = 1
-        root.tree_sort = i
-        # with disable_auto_indexing(model=self.model):
-        #     root.save()
-        root.save()
-        for child in root.children.order_by('kind', 'code', 'name'):
+        positions[root] = i
+        children = self.filter(
+            parent_id=root,
+        ).order_by(
+            'kind',
+            'code',
+            'name',
+        ).values_list('id', flat=True)
+        for child in children:
             i += 1
-            child.tree_sort = i
-            # with disable_auto_indexing(model=self.model):
-            #     child.save()
-            child.save()
+            positions[child] = i
         orgs = self.filter(
             kind__in=[
                 self.model.KIND.district,
@@ -306,14 +454,40 @@ class GroupManager(Manager):
         ).order_by(
             'kind',
             'name',
-        )
+        ).values_list('id', flat=True)
         for org in orgs:
             i += 1
-            org.tree_sort = i
-            # with disable_auto_indexing(model=self.model):
-            #     org.save()
-            org.save()
-        return
+            positions[org] = i
+
+        # Only rewrite rows that moved.  Updates bypass save() so
+        # `modified` is left alone.
+        moved = [
+            self.model(id=pk, tree_sort=positions.get(pk))
+            for pk, tree_sort in self.values_list('id', 'tree_sort')
+            if positions.get(pk) != tree_sort
+        ]
+        if not moved:
+            return 0
+        with transaction.atomic():
+            # Clear the moved rows first so the unique index never sees
+            # a transient duplicate.
+            self.filter(
+                id__in=[group.id for group in moved],
+            ).update(tree_sort=None)
+            self.bulk_update(
+                [group for group in moved if group.tree_sort is not None],
+                ['tree_sort'],
+                batch_size=1000,
+            )
+            Change = apps.get_model('bhs.change')
+            Change.objects.record(
+                self.model,
+                Change.ACTION.updated,
+                [group.id for group in moved],
+            )
+        # `modified` didn't change, so bump the API validators instead.
+        invalidate('group')
+        return len(moved)
 
     # def denormalize(self, cursor=None):
     #     groups = self.filter(status=self.model.STATUS.active)
@@ -403,103 +577,38 @@ class PersonManager(Manager):
             return ValueError("Must be dictionary")
 
         mc_pk = human['id']
-        first_name = human['first_name']
-        middle_name = human['middle_name']
-        last_name = human['last_name']
-        nick_name = human['nick_name']
-        email = human['email']
-        birth_date = human['birth_date']
-        home_phone = human['home_phone']
-        cell_phone = human['cell_phone']
-        work_phone = human['work_phone']
-        bhs_id = human['bhs_id']
-        gender = human['gender']
-        part = human['part']
-        mon = human['mon']
-        is_deceased = human['is_deceased']
-        # is_honorary = human['is_honorary']
-        # is_suspended = human['is_suspended']
-        # is_expelled = human['is_expelled']
-        status = human['status']
-        current_through = human['current_through']
-
-        _, prefix, first_name = first_name.rpartition('Dr.')
-        last_name, suffix, _ = last_name.partition('II')
-        last_name, suffix, _ = last_name.partition('II')
-        last_name, suffix, _ = last_name.partition('DDS')
-        last_name, suffix, _ = last_name.partition('M.D.')
-        if last_name.endswith('Sr'):
-            last_name, suffix, _ = last_name.partition('Sr')
-        if last_name.endswith('Jr'):
-            last_name, suffix, _ = last_name.partition('Jr')
-
-        if nick_name == first_name:
-            nick_name = ""
-
-        if prefix:
-            prefix = prefix.strip()
-
-        first_name.translate(
-            first_name.maketrans('', '', '!"#$%&()*+,./:;<=>?@[\\]^_`{|}~')
-        ).strip()
-
-        last_name.translate(
-            last_name.maketrans('', '', '!"#$%&()*+,./:;<=>?@[\\]^_`{|}~')
-        ).strip()
-
-        if middle_name:
-            middle_name.translate(
-                middle_name.maketrans('', '', '!"#$%&()*+,./:;<=>?@[\\]^_`{|}~')
-            ).strip()
-        else:
-            middle_name = ""
-
-        if nick_name:
-            nick_name.translate(
-                nick_name.maketrans('', '', '!"#$%&()*+,./:;<=>?@[\\]^_`{|}~')
-            ).strip()
-        else:
-            nick_name = ""
-
-        if suffix:
-            suffix = suffix.strip()
-
-        home_phone = validate_phone(home_phone)
-        cell_phone = validate_phone(cell_phone)
-        work_phone = validate_phone(work_phone)
-
-        email = validate_email(email)
-
-        gender = getattr(self.model.GENDER, gender, None) if gender else None
-        part = getattr(self.model.PART, part, None) if part else None
-
-        is_deceased = bool(is_deceased)
-
-        defaults = {
-            'status': status,
-            'prefix': prefix,
-            'first_name': first_name,
-            'middle_name': middle_name,
-            'last_name': last_name,
-            'suffix': suffix,
-            'nick_name': nick_name,
-            'email': email,
-            'birth_date': birth_date,
-            'home_phone': home_phone,
-            'cell_phone': cell_phone,
-            'work_phone': work_phone,
-            'bhs_id': bhs_id,
-            'gender': gender,
-            'part': part,
-            'is_deceased': is_deceased,
-            'mon': mon,
-            'current_through': current_through,
-        }
+        defaults = normalize_human(human, self.model)
+
+        # Skip unchanged
+        digest = get_digest(defaults)
+        person = self.filter(id=mc_pk, digest=digest).first()
+        if person:
+            return person, False
+        defaults['digest'] = digest
+
         # Update or create
         person, created = self.update_or_create(
             id=mc_pk,
             defaults=defaults,
         )
+        self.update_user(person)
+        person.update_owners()
+        return person, created
+
+    @timed
+    def update_or_create_from_humans(self, humans):
+        started = time.perf_counter()
+        defaults = {}
+        for values in normalize_humans(humans):
+            defaults[values.pop('id')] = values
+        transform_time = time.perf_counter() - started
+        stats, pks = bulk_update_or_create(self, defaults)
+        stats['transform_time'] = transform_time
+        self.update_users(pks)
+        # Owners are recomputed in a separate stage once the sync is done.
+        return stats
+
+    def update_user(self, person):
         # Update and create user accounts conditionally:
         if person.email and person.status == person.STATUS.active:
             defaults = {
@@ -511,18 +620,72 @@ class PersonManager(Manager):
                 email=person.email,
                 defaults=defaults,
             )
-        person.update_owners()
-        return person, created
+        return
 
-    def delete_orphans(self, humans):
-        # Delete Orphans
-        orphans = self.filter(
-            id__isnull=False,
+    def update_users(self, pks):
+        persons = self.filter(
+            id__in=pks,
+            status=self.model.STATUS.active,
+            email__isnull=False,
         ).exclude(
-            id__in=humans,
+            email='',
+        )
+        users = {
+            user.email: user
+            for user in User.objects.filter(
+                email__in=persons.values('email'),
+            )
+        }
+        changed = []
+        for person in persons:
+            user = users.get(person.email)
+            if not user:
+                self.update_user(person)
+                continue
+            defaults = {
+                'name': person.name,
+                'first_name': person.first_name,
+                'last_name': person.last_name,
+            }
+            if any(getattr(user, key) != value for key, value in defaults.items()):
+                for key, value in defaults.items():
+                    setattr(user, key, value)
+                changed.append(user)
+        User.objects.bulk_update(changed, ['name', 'first_name', 'last_name'])
+        return
+
+    def update_owners(self, pks):
+        pks = list(pks)
+        emails = self.filter(
+            id__in=pks,
+            email__isnull=False,
+        ).values_list('id', 'email')
+        users = {}
+        for user_id, email in User.objects.filter(
+            email__in={email for _, email in emails},
+        ).values_list('id', 'email'):
+            users.setdefault(email, []).append(user_id)
+        owners = [
+            (person_id, user_id)
+            for person_id, email in emails
+            for user_id in users.get(email, [])
+        ]
+        return set_owners(self, pks, owners)
+
+    def delete_orphans(self, humans):
+        # Deleting a Person drops their Officers too, so the owners of
+        # those Groups are recomputed once the Persons are gone.
+        Officer = apps.get_model('bhs.officer')
+        groups = set()
+        t = delete_orphans(
+            self.all(),
+            ['id'],
+            humans,
+            collect=lambda pks: groups.update(
+                Officer.objects.filter(person_id__in=pks).values_list('group_id', flat=True)
+            ),
         )
-        t = orphans.count()
-        orphans.delete()
+        update_group_owners(groups)
         return t
 
     def export_orphans(self, cursor=None):
@@ -549,31 +712,34 @@ class PersonManager(Manager):
 
 
 class OfficerManager(Manager):
-    def update_or_create_from_role(self, role):
+    def update_or_create_from_role(self, role, update_owners=True):
         # Extract
         if not isinstance(role, dict):
             raise RuntimeError("Must be pre-processed")
-        # mc_pk = role['id']
-        # name = role['name']
-        start_date = role['startest_date']
-        end_date = role['endest_date']
         person_pk = role['human_id']
         group_pk = role['structure_id']
-        status = role['status']
 
         # Transform
         Person = apps.get_model('bhs.person')
         Group = apps.get_model('bhs.group')
 
-        defaults = {
-            'status': status,
-            'start_date': start_date,
-            'end_date': end_date,
-        }
+        defaults = normalize_role(role)
+        office = self.model.OFFICE.manager
+
+        # Skip unchanged
+        digest = get_digest(defaults)
+        officer = self.filter(
+            person_id=person_pk,
+            group_id=group_pk,
+            office=office,
+            digest=digest,
+        ).first()
+        if officer:
+            return officer, False
+        defaults['digest'] = digest
 
         person = Person.objects.get(id=person_pk)
         group = Group.objects.get(id=group_pk)
-        office = self.model.OFFICE.manager
 
         # Load
         officer, created = self.update_or_create(
@@ -583,19 +749,80 @@ class OfficerManager(Manager):
             defaults=defaults,
         )
         # Add owners
-        group.update_owners()
+        if update_owners:
+            group.update_owners()
         return officer, created
 
+    @timed
+    def update_or_create_from_roles(self, roles):
+        # Owners are recomputed in a separate stage once the sync is done.
+        stats = Counter()
+        office = self.model.OFFICE.manager
+        started = time.perf_counter()
+        rows = normalize_roles(roles)
+        stats['transform_time'] = time.perf_counter() - started
+        defaults, stats['failed'] = resolve_keys(self.model, rows)
+        for values in defaults.values():
+            values['digest'] = get_digest(values)
+
+        # Skip unchanged
+        digests = {
+            (group_id, person_id): digest
+            for group_id, person_id, digest in self.filter(
+                office=office,
+                group_id__in={group_id for group_id, _ in defaults},
+                person_id__in={person_id for _, person_id in defaults},
+            ).values_list('group_id', 'person_id', 'digest')
+        }
+        for key, values in list(defaults.items()):
+            if digests.get(key) == values['digest']:
+                del defaults[key]
+                stats['unchanged'] += 1
+        if not defaults:
+            return stats
+
+        # Load with a single upsert on the (group, person, office) key, so
+        # chunks racing on the same pair can't both insert; fall back to
+        # row-by-row if any row is rejected.
+        objs = [
+            self.model(group_id=group_id, person_id=person_id, office=office, **values)
+            for (group_id, person_id), values in defaults.items()
+        ]
+        fields = list(next(iter(defaults.values())))
+        try:
+            with transaction.atomic():
+                rows = bulk_upsert(self.model, objs, ['group', 'person', 'office'], fields)
+            stats['created'] = sum(inserted for _, inserted in rows)
+            stats['updated'] = len(rows) - stats['created']
+        except IntegrityError:
+            for (group_id, person_id), values in defaults.items():
+                try:
+                    with transaction.atomic():
+                        _, created = self.update_or_create(
+                            group_id=group_id,
+                            person_id=person_id,
+                            office=office,
+                            defaults=values,
+                        )
+                except IntegrityError:
+                    stats['failed'] += 1
+                    continue
+                stats['created' if created else 'updated'] += 1
+        return stats
 
     def delete_orphans(self, roles):
-        # Delete Orphans
-        orphans = self.filter(
-            id__isnull=False,
-        ).exclude(
-            id__in=roles,
+        # Officers make their Group's owners, so recompute them once the
+        # orphans are gone.
+        groups = set()
+        t = delete_orphans(
+            self.filter(office=self.model.OFFICE.manager),
+            ['group_id', 'person_id'],
+            roles,
+            collect=lambda pks: groups.update(
+                self.filter(id__in=pks).values_list('group_id', flat=True)
+            ),
         )
-        t = orphans.count()
-        orphans.delete()
+        update_group_owners(groups)
         return t
 
 
@@ -608,27 +835,20 @@ class MemberManager(Manager):
             raise RuntimeError("Must be pre-validated")
 
         # mc_pk = join['id']
-        start_date = join['startest_date']
-        end_date = join['endest_date']
-        vocal_part = join['vocal_part']
         group_pk = join['structure__id']
         person_pk = join['subscription__human__id']
-        status = join['status']
-
-        # Transform
-        part = getattr(
-            self.model.PART,
-            vocal_part.strip().lower() if vocal_part else '',
-            None,
-        )
-
-        # Build dictionary
-        defaults = {
-            'status': status,
-            'start_date': start_date,
-            'end_date': end_date,
-            'part': part,
-        }
+        defaults = normalize_join(join, self.model)
+
+        # Skip unchanged
+        digest = get_digest(defaults)
+        member = self.filter(
+            person_id=person_pk,
+            group_id=group_pk,
+            digest=digest,
+        ).first()
+        if member:
+            return member, False
+        defaults['digest'] = digest
 
         person = Person.objects.get(id=person_pk)
         group = Group.objects.get(id=group_pk)
@@ -661,14 +881,57 @@ class MemberManager(Manager):
         #     person.owners.add(user)
         return member, created
 
+    @timed
+    def update_or_create_from_joins(self, joins):
+        stats = Counter()
+        started = time.perf_counter()
+        rows = normalize_joins(joins)
+        stats['transform_time'] = time.perf_counter() - started
+        defaults, stats['failed'] = resolve_keys(self.model, rows)
+        for values in defaults.values():
+            values['digest'] = get_digest(values)
+
+        # Skip unchanged
+        digests = {
+            (group_id, person_id): digest
+            for group_id, person_id, digest in self.filter(
+                group_id__in={group_id for group_id, _ in defaults},
+                person_id__in={person_id for _, person_id in defaults},
+            ).values_list('group_id', 'person_id', 'digest')
+        }
+        for key, values in list(defaults.items()):
+            if digests.get(key) == values['digest']:
+                del defaults[key]
+                stats['unchanged'] += 1
+        if not defaults:
+            return stats
+
+        # Load with a single upsert on the (group, person) key; fall back
+        # to row-by-row if any row is rejected.
+        objs = [
+            self.model(group_id=group_id, person_id=person_id, **values)
+            for (group_id, person_id), values in defaults.items()
+        ]
+        fields = list(next(iter(defaults.values())))
+        try:
+            with transaction.atomic():
+                rows = bulk_upsert(self.model, objs, ['group', 'person'], fields)
+            stats['created'] = sum(inserted for _, inserted in rows)
+            stats['updated'] = len(rows) - stats['created']
+        except IntegrityError:
+            for (group_id, person_id), values in defaults.items():
+                try:
+                    with transaction.atomic():
+                        _, created = self.update_or_create(
+                            group_id=group_id,
+                            person_id=person_id,
+                            defaults=values,
+                        )
+                except IntegrityError:
+                    stats['failed'] += 1
+                    continue
+                stats['created' if created else 'updated'] += 1
+        return stats
 
     def delete_orphans(self, joins):
-        # Delete Orphans
-        orphans = self.filter(
-            id__isnull=False,
-        ).exclude(
-            id__in=joins,
-        )
-        t = orphans.count()
-        orphans.delete()
-        return t
+        return delete_orphans(self.all(), ['group_id', 'person_id'], joins)
@@ -0,0 +1,95 @@
+# Standard Library
+import json
+import logging
+import time
+from collections import Counter
+
+# Django
+from django.utils import timezone
+
+
+log = logging.getLogger('updater')
+
+FIELDS = [
+    'exported',
+    'export_time',
+    'transform_time',
+    'load_time',
+    'created',
+    'updated',
+    'unchanged',
+    'failed',
+    'cache_hits',
+    'cache_misses',
+]
+
+
+class SyncMetrics(object):
+    """Per-entity counts and stage timings for one sync run.
+
+    Batch sync methods return a Counter with their row counts,
+    `transform_time`/`load_time` and validator cache hits and misses; the
+    export side is timed here as pages are pulled from the source.
+    """
+
+    def __init__(self):
+        self.started = timezone.now()
+        self.entities = {}
+
+    def get(self, source):
+        return self.entities.setdefault(source, Counter())
+
+    def update(self, source, stats):
+        if stats:
+            self.get(source).update(stats)
+
+    def pages(self, source, pages):
+        """Pass through an export page iterator, timing each fetch."""
+        stats = self.get(source)
+        pages = iter(pages)
+        while True:
+            started = time.perf_counter()
+            rows = next(pages, None)
+            stats['export_time'] += time.perf_counter() - started
+            if rows is None:
+                return
+            stats['exported'] += len(rows)
+            yield rows
+
+    def as_dict(self):
+        return {
+            'started': self.started.isoformat(),
+            'finished': timezone.now().isoformat(),
+            'entities': {
+                source: {field: stats[field] for field in FIELDS}
+                for source, stats in self.entities.items()
+            },
+        }
+
+    def report(self):
+        """Log one line per entity, with the numbers attached as `extra`."""
+        for source, stats in self.entities.items():
+            values = {field: stats[field] for field in FIELDS}
+            rate = stats['exported'] / stats['load_time'] if stats['load_time'] else 0.0
+            lookups = stats['cache_hits'] + stats['cache_misses']
+            hit_rate = stats['cache_hits'] / lookups if lookups else 0.0
+            log.info(
+                "%s: %d exported in %.1fs, transform %.1fs, load %.1fs (%.0f rows/s); "
+                "%d created, %d updated, %d unchanged, %d failed; validator cache hit rate %.0f%%",
+                source,
+                stats['exported'],
+                stats['export_time'],
+                stats['transform_time'],
+                stats['load_time'],
+                rate,
+                stats['created'],
+                stats['updated'],
+                stats['unchanged'],
+                stats['failed'],
+                hit_rate * 100,
+                extra={'source': source, 'metrics': values},
+            )
+
+    def write(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.as_dict(), f, indent=2)
@@ -0,0 +1,29 @@
+# Generated by Django 3.1.14 on 2026-10-18 09:12
+
+from django.db import migrations, models
+import django.utils.timezone
+import model_utils.fields
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bhs', '0003_auto_20190828_1213'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Checkpoint',
+            fields=[
+                ('created', model_utils.fields.AutoCreatedField(default=django.utils.timezone.now, editable=False, verbose_name='created')),
+                ('modified', model_utils.fields.AutoLastModifiedField(default=django.utils.timezone.now, editable=False, verbose_name='modified')),
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('source', models.CharField(choices=[('human', 'Human'), ('structure', 'Structure'), ('role', 'Role'), ('join', 'Join')], editable=False, help_text='\n            The source model being synced.', max_length=255, unique=True)),
+                ('cursor', models.DateTimeField(blank=True, editable=False, help_text='\n            The source `modified` high-water mark of the last complete sync.', null=True)),
+            ],
+            options={
+                'verbose_name_plural': 'Checkpoints',
+            },
+        ),
+    ]
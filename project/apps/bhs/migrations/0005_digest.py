@@ -0,0 +1,33 @@
+# Generated by Django 3.1.14 on 2026-10-18 10:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bhs', '0004_checkpoint'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='group',
+            name='digest',
+            field=models.CharField(blank=True, default='', editable=False, help_text='\n            Fingerprint of the last synced source values.', max_length=40),
+        ),
+        migrations.AddField(
+            model_name='member',
+            name='digest',
+            field=models.CharField(blank=True, default='', editable=False, help_text='\n            Fingerprint of the last synced source values.', max_length=40),
+        ),
+        migrations.AddField(
+            model_name='officer',
+            name='digest',
+            field=models.CharField(blank=True, default='', editable=False, help_text='\n            Fingerprint of the last synced source values.', max_length=40),
+        ),
+        migrations.AddField(
+            model_name='person',
+            name='digest',
+            field=models.CharField(blank=True, default='', editable=False, help_text='\n            Fingerprint of the last synced source values.', max_length=40),
+        ),
+    ]
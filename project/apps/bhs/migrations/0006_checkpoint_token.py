@@ -0,0 +1,18 @@
+# Generated by Django 3.1.14 on 2026-10-18 11:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bhs', '0005_digest'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='checkpoint',
+            name='token',
+            field=models.CharField(blank=True, default='', editable=False, help_text='\n            Where an interrupted chunked sync should resume.', max_length=255),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 3.1.14 on 2026-10-18 15:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bhs', '0006_checkpoint_token'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Change',
+            fields=[
+                ('seq', models.BigAutoField(primary_key=True, serialize=False)),
+                ('resource', models.CharField(choices=[('group', 'Group'), ('person', 'Person')], editable=False, help_text='\n            The kind of record that changed.', max_length=255)),
+                ('object_id', models.UUIDField(editable=False, help_text='\n            The primary key of the record that changed.')),
+                ('action', models.IntegerField(choices=[(10, 'Created'), (20, 'Updated'), (30, 'Deleted')], editable=False)),
+                ('created', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name_plural': 'Changes',
+            },
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 3.1.14 on 2026-10-18 17:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bhs', '0007_change'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='group',
+            index=models.Index(fields=['modified', 'id'], name='bhs_group_modified_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='person',
+            index=models.Index(fields=['modified', 'id'], name='bhs_person_modified_id_idx'),
+        ),
+    ]
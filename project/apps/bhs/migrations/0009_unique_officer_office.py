@@ -0,0 +1,42 @@
+# Generated by Django 3.1.14 on 2026-10-18 19:40
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def delete_duplicate_officers(apps, schema_editor):
+    # Keep the most recently modified officer of each duplicate set.
+    Officer = apps.get_model('bhs', 'Officer')
+    duplicates = Officer.objects.values(
+        'group_id',
+        'person_id',
+        'office',
+    ).annotate(
+        n=Count('id'),
+    ).filter(
+        n__gt=1,
+    )
+    for duplicate in duplicates:
+        pks = list(Officer.objects.filter(
+            group_id=duplicate['group_id'],
+            person_id=duplicate['person_id'],
+            office=duplicate['office'],
+        ).order_by(
+            '-modified',
+        ).values_list('id', flat=True))
+        Officer.objects.filter(id__in=pks[1:]).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bhs', '0008_modified_id_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(delete_duplicate_officers, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='officer',
+            constraint=models.UniqueConstraint(fields=('group', 'person', 'office'), name='unique_officer_office'),
+        ),
+    ]
@@ -0,0 +1,183 @@
+# Standard Library
+import hashlib
+
+# Third-Party
+from phonenumber_field.phonenumber import PhoneNumber
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+# Django
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Count
+from django.db.models import Max
+from django.http import HttpResponse
+from django.http import StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.cache import quote_etag
+from django.utils.http import http_date
+
+# Local
+from .caching import RESPONSE_TIMEOUT
+from .caching import get_generation
+from .caching import get_response_key
+from .pagination import CURSOR_PARAM
+
+
+class CachedListMixin(object):
+    """Serve repeated list requests from the cache.
+
+    Responses are keyed on the resource, the query parameters and the
+    requester's permission tier, and are stored rendered.
+    """
+
+    def get_cache_tier(self, request):
+        # Permissions are serialized per row, so by default only staff,
+        # who can do everything, share cached responses.
+        if request.user.is_staff or request.user.is_superuser:
+            return 'staff'
+        return 'user:{0}'.format(request.user.pk)
+
+    def list(self, request, *args, **kwargs):
+        # Under ConditionalMixin the key also follows the data's validator,
+        # so writes that send no signals can't serve stale content.
+        key = get_response_key(
+            self.resource_name,
+            self.get_cache_tier(request),
+            request,
+            getattr(self, 'etag', ''),
+        )
+        cached = cache.get(key)
+        if cached is not None:
+            content, content_type = cached
+            return HttpResponse(content, content_type=content_type)
+        response = super().list(request, *args, **kwargs)
+        if response.status_code == 200:
+            response.add_post_render_callback(
+                lambda response: cache.set(
+                    key,
+                    (response.content, response['Content-Type']),
+                    RESPONSE_TIMEOUT,
+                ),
+            )
+        return response
+
+
+class ConditionalMixin(object):
+    """Answer unchanged GETs with 304 Not Modified.
+
+    The collection validator is the `Max('modified')` and count of the
+    filtered queryset, so a poll that finds nothing new costs one
+    aggregate query and no serialization.  Deletes don't raise
+    `Max('modified')`, so collections are validated on the ETag alone
+    and send no `Last-Modified`.  Objects use their own `modified`.
+    Both ETags also carry the resource's cache generation, which writes
+    that leave `modified` alone bump instead.  Keyset pages are not
+    validated.  Expects `get_cache_tier` from `CachedListMixin`,
+    since the serialized permissions differ by tier.
+    """
+
+    def get_etag(self, request, *parts):
+        params = sorted(
+            (key, value)
+            for key in request.query_params
+            for value in request.query_params.getlist(key)
+        )
+        value = "{0}|{1}|{2}|{3}".format(
+            self.resource_name,
+            self.get_cache_tier(request),
+            params,
+            "|".join(str(part) for part in parts),
+        )
+        return quote_etag(hashlib.sha1(value.encode()).hexdigest())
+
+    def conditional(self, request, handler, *parts, modified=None):
+        # The generation covers writes that leave `modified` alone, like
+        # the tree sort.
+        etag = self.get_etag(request, get_generation(self.resource_name), *parts)
+        last_modified = int(modified.timestamp()) if modified else None
+        response = get_conditional_response(
+            request._request,
+            etag=etag,
+            last_modified=last_modified,
+        )
+        if response is not None:
+            return response
+        self.etag = etag
+        response = handler()
+        if response.status_code == 200:
+            response['ETag'] = etag
+            if last_modified:
+                response['Last-Modified'] = http_date(last_modified)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        # A keyset crawl must not pay for a count on every page.
+        if CURSOR_PARAM in request.query_params:
+            return super().list(request, *args, **kwargs)
+        state = self.filter_queryset(self.get_queryset()).order_by().aggregate(
+            modified=Max('modified'),
+            count=Count('id'),
+        )
+        return self.conditional(
+            request,
+            lambda: super(ConditionalMixin, self).list(request, *args, **kwargs),
+            state['modified'],
+            state['count'],
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        # Look the object up first, so bad ids still 404 and object
+        # permissions are checked before any 304.
+        instance = self.get_object()
+        return self.conditional(
+            request,
+            lambda: Response(self.get_serializer(instance).data),
+            instance.modified,
+            modified=instance.modified,
+        )
+
+
+class ExportEncoder(DjangoJSONEncoder):
+    def default(self, o):
+        if isinstance(o, PhoneNumber):
+            return o.as_e164
+        return super().default(o)
+
+
+class ExportMixin(object):
+    """Stream the whole filtered collection as newline-delimited JSON.
+
+    Rows are read as plain values through a server-side cursor and encoded
+    one at a time, bypassing the serializer and the JSON:API renderer, so
+    memory stays flat however large the export.  Only the serializer's
+    concrete columns are exported; relations appear as their keys.
+    """
+    export_chunk_size = 2000
+
+    def get_export_fields(self):
+        fields = self.get_serializer_class().Meta.fields
+        return [
+            field.attname
+            for field in self.get_queryset().model._meta.concrete_fields
+            if field.name in fields
+        ]
+
+    def get_export_rows(self, queryset, fields):
+        encoder = ExportEncoder()
+        for row in queryset.values(*fields).iterator(chunk_size=self.export_chunk_size):
+            yield encoder.encode(row) + '\n'
+
+    @action(detail=False, methods=['get'])
+    def export(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        # Prefetches don't apply to values, and `id` keeps the order stable.
+        queryset = queryset.prefetch_related(None).order_by('id')
+        response = StreamingHttpResponse(
+            self.get_export_rows(queryset, self.get_export_fields()),
+            content_type='application/x-ndjson',
+        )
+        response['Content-Disposition'] = 'attachment; filename="{0}.ndjson"'.format(
+            self.resource_name,
+        )
+        return response
@@ -24,18 +24,177 @@ from django.contrib.postgres.fields import ArrayField
 from django.core.files.base import ContentFile
 from django.db import models
 from django.utils.functional import cached_property
-from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
 
 # Local
 from .fields import ImageUploadPath
+from .managers import ChangeManager
+from .managers import CheckpointManager
 from .managers import MemberManager
 from .managers import GroupManager
 from .managers import OfficerManager
 from .managers import PersonManager
 
 
-class Group(TimeStampedModel):
+def get_role_names(request):
+    """Return the names of the requesting user's roles, once per request."""
+    if not hasattr(request, '_role_names'):
+        request._role_names = set(request.user.roles.values_list('name', flat=True))
+    return request._role_names
+
+
+class DigestMixin(object):
+    """Forget the sync digest when a row is saved outside the sync.
+
+    The sync skips rows whose digest matches the source, so a local edit
+    (through the API, the admin or a status transition) would otherwise
+    never be corrected.  Sync saves always write a new digest; any other
+    save leaves the loaded one in place, which is how they are told apart.
+    """
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_digest = instance.__dict__.get('digest')
+        return instance
+
+    def save(self, *args, **kwargs):
+        if self.digest and self.digest == getattr(self, '_loaded_digest', None):
+            self.digest = ''
+            if kwargs.get('update_fields') is not None:
+                kwargs['update_fields'] = set(kwargs['update_fields']) | {'digest'}
+        super().save(*args, **kwargs)
+        self._loaded_digest = self.digest
+
+
+class Change(models.Model):
+    seq = models.BigAutoField(
+        primary_key=True,
+    )
+
+    RESOURCE = Choices(
+        ('group', 'Group'),
+        ('person', 'Person'),
+    )
+
+    resource = models.CharField(
+        help_text="""
+            The kind of record that changed.""",
+        max_length=255,
+        choices=RESOURCE,
+        editable=False,
+    )
+
+    object_id = models.UUIDField(
+        help_text="""
+            The primary key of the record that changed.""",
+        editable=False,
+    )
+
+    ACTION = Choices(
+        (10, 'created', 'Created'),
+        (20, 'updated', 'Updated'),
+        (30, 'deleted', 'Deleted'),
+    )
+
+    action = models.IntegerField(
+        choices=ACTION,
+        editable=False,
+    )
+
+    created = models.DateTimeField(
+        auto_now_add=True,
+        editable=False,
+    )
+
+    # Internals
+    objects = ChangeManager()
+
+    class Meta:
+        verbose_name_plural = 'Changes'
+
+    def __str__(self):
+        return "{0} {1} {2}".format(
+            self.seq,
+            self.resource,
+            self.object_id,
+        )
+
+    # Permissions
+    @staticmethod
+    @allow_staff_or_superuser
+    @authenticated_users
+    def has_read_permission(request):
+        return True
+
+    @allow_staff_or_superuser
+    @authenticated_users
+    def has_object_read_permission(self, request):
+        return True
+
+    @staticmethod
+    @allow_staff_or_superuser
+    @authenticated_users
+    def has_write_permission(request):
+        return False
+
+    @allow_staff_or_superuser
+    @authenticated_users
+    def has_object_write_permission(self, request):
+        return False
+
+
+class Checkpoint(TimeStampedModel):
+    id = models.UUIDField(
+        primary_key=True,
+        default=uuid.uuid4,
+        editable=False,
+    )
+
+    SOURCE = Choices(
+        ('human', 'Human'),
+        ('structure', 'Structure'),
+        ('role', 'Role'),
+        ('join', 'Join'),
+    )
+
+    source = models.CharField(
+        help_text="""
+            The source model being synced.""",
+        max_length=255,
+        choices=SOURCE,
+        unique=True,
+        editable=False,
+    )
+
+    cursor = models.DateTimeField(
+        help_text="""
+            The source `modified` high-water mark of the last complete sync.""",
+        blank=True,
+        null=True,
+        editable=False,
+    )
+
+    token = models.CharField(
+        help_text="""
+            Where an interrupted chunked sync should resume.""",
+        max_length=255,
+        blank=True,
+        default='',
+        editable=False,
+    )
+
+    # Internals
+    objects = CheckpointManager()
+
+    class Meta:
+        verbose_name_plural = 'Checkpoints'
+
+    def __str__(self):
+        return str(self.source)
+
+
+class Group(DigestMixin, TimeStampedModel):
     id = models.UUIDField(
         primary_key=True,
         default=uuid.uuid4,
@@ -368,6 +527,15 @@ class Group(TimeStampedModel):
         editable=False,
     )
 
+    digest = models.CharField(
+        help_text="""
+            Fingerprint of the last synced source values.""",
+        max_length=40,
+        blank=True,
+        default='',
+        editable=False,
+    )
+
     # Group FKs
     owners = models.ManyToManyField(
         settings.AUTH_USER_MODEL,
@@ -426,19 +594,7 @@ class Group(TimeStampedModel):
 
     # Group Methods
     def update_owners(self):
-        User = get_user_model()
-        emails = self.officers.filter(
-            person__email__isnull=False,
-        ).values_list(
-            'person__email',
-            flat=True,
-        )
-        owners = User.objects.filter(
-            email__in=emails,
-        ).distinct()
-        self.owners.set(owners)
-        # the self.save is only necessary to touch the modified field.
-        return self.save()
+        return Group.objects.update_owners([self.pk])
 
     def get_roster(self):
         Member = apps.get_model('bhs.member')
@@ -582,6 +738,16 @@ class Group(TimeStampedModel):
                 ]
             )
         ]
+        indexes = [
+            # Keyset pages walk (modified, id).
+            models.Index(
+                name='bhs_group_modified_id_idx',
+                fields=[
+                    'modified',
+                    'id',
+                ]
+            ),
+        ]
 
     class JSONAPIMeta:
         resource_name = "group"
@@ -767,22 +933,23 @@ class Group(TimeStampedModel):
     @authenticated_users
     def has_write_permission(request):
         return any([
-            request.user.roles.filter(name__in=[
+            get_role_names(request) & {
                 'SCJC',
                 'Librarian',
                 'Manager',
-            ])
+            },
         ])
 
     @allow_staff_or_superuser
     @authenticated_users
     def has_object_write_permission(self, request):
+        # Owners are prefetched by the viewset.
         return any([
-            request.user.roles.filter(name__in=[
+            get_role_names(request) & {
                 'SCJC',
                 'DRCJ',
                 'Manager',
-            ]),
+            },
             request.user in self.owners.all(),
         ])
 
@@ -826,7 +993,7 @@ class Group(TimeStampedModel):
     #     return
 
 
-class Member(TimeStampedModel):
+class Member(DigestMixin, TimeStampedModel):
     id = models.UUIDField(
         primary_key=True,
         default=uuid.uuid4,
@@ -867,6 +1034,15 @@ class Member(TimeStampedModel):
         blank=True,
     )
 
+    digest = models.CharField(
+        help_text="""
+            Fingerprint of the last synced source values.""",
+        max_length=40,
+        blank=True,
+        default='',
+        editable=False,
+    )
+
     # Properties
     # FKs
     group = models.ForeignKey(
@@ -944,7 +1120,7 @@ class Member(TimeStampedModel):
         return
 
 
-class Officer(TimeStampedModel):
+class Officer(DigestMixin, TimeStampedModel):
     id = models.UUIDField(
         primary_key=True,
         default=uuid.uuid4,
@@ -986,6 +1162,15 @@ class Officer(TimeStampedModel):
         blank=True,
     )
 
+    digest = models.CharField(
+        help_text="""
+            Fingerprint of the last synced source values.""",
+        max_length=40,
+        blank=True,
+        default='',
+        editable=False,
+    )
+
     # FKs
     person = models.ForeignKey(
         'Person',
@@ -1013,6 +1198,16 @@ class Officer(TimeStampedModel):
     # Internals
     class Meta:
         verbose_name_plural = 'Officers'
+        constraints = [
+            models.UniqueConstraint(
+                name='unique_officer_office',
+                fields=[
+                    'group',
+                    'person',
+                    'office',
+                ]
+            )
+        ]
 
     class JSONAPIMeta:
         resource_name = "officer"
@@ -1070,7 +1265,7 @@ class Officer(TimeStampedModel):
         return
 
 
-class Person(TimeStampedModel):
+class Person(DigestMixin, TimeStampedModel):
     id = models.UUIDField(
         primary_key=True,
         default=uuid.uuid4,
@@ -1297,6 +1492,15 @@ class Person(TimeStampedModel):
         editable=False,
     )
 
+    digest = models.CharField(
+        help_text="""
+            Fingerprint of the last synced source values.""",
+        max_length=40,
+        blank=True,
+        default='',
+        editable=False,
+    )
+
     # Relations
     owners = models.ManyToManyField(
         settings.AUTH_USER_MODEL,
@@ -1430,6 +1634,16 @@ class Person(TimeStampedModel):
 
     class Meta:
         verbose_name_plural = 'Persons'
+        indexes = [
+            # Keyset pages walk (modified, id).
+            models.Index(
+                name='bhs_person_modified_id_idx',
+                fields=[
+                    'modified',
+                    'id',
+                ]
+            ),
+        ]
 
     class JSONAPIMeta:
         resource_name = "person"
@@ -1442,11 +1656,7 @@ class Person(TimeStampedModel):
 
     # Person Methods
     def update_owners(self):
-        User = get_user_model()
-        owners = User.objects.filter(
-            email=self.email,
-        )
-        return self.owners.set(owners)
+        return Person.objects.update_owners([self.pk])
 
     # Permissions
     @staticmethod
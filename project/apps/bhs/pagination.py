@@ -0,0 +1,130 @@
+# Standard Library
+import base64
+import binascii
+import uuid
+from collections import OrderedDict
+
+# Third-Party
+from rest_framework.exceptions import NotFound
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+from rest_framework_json_api.pagination import JsonApiPageNumberPagination
+
+# Django
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+
+CURSOR_PARAM = 'page[cursor]'
+
+
+class JsonApiKeysetPagination(JsonApiPageNumberPagination):
+    """Page numbers by default; keyset pages when `page[cursor]` is given.
+
+    Keyset pages are ordered on `(modified, id)` and start after the row
+    named by the cursor, so each page is one indexed range scan with no
+    OFFSET and no COUNT.  Pass an empty `page[cursor]` for the first page
+    and follow `links.next` from there; `sort` is ignored.
+    """
+    cursor_query_param = CURSOR_PARAM
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = self.cursor_query_param in request.query_params
+        if not self.keyset:
+            return super().paginate_queryset(queryset, request, view)
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        after = self.decode_cursor(request.query_params[self.cursor_query_param])
+        queryset = queryset.order_by('modified', 'id')
+        if after:
+            modified, pk = after
+            queryset = queryset.filter(
+                Q(modified__gt=modified) | Q(modified=modified, id__gt=pk),
+            )
+        rows = list(queryset[:self.page_size + 1])
+        self.has_next = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        self.last = rows[-1] if rows else None
+        return rows
+
+    def encode_cursor(self, obj):
+        value = "{0}|{1}".format(obj.modified.isoformat(), obj.pk)
+        return base64.urlsafe_b64encode(value.encode()).decode()
+
+    def decode_cursor(self, cursor):
+        if not cursor:
+            return None
+        try:
+            modified, pk = base64.urlsafe_b64decode(cursor.encode()).decode().split('|')
+            modified = parse_datetime(modified)
+            pk = uuid.UUID(pk)
+        except (TypeError, ValueError, binascii.Error):
+            raise NotFound(self.invalid_cursor_message)
+        if modified is None:
+            raise NotFound(self.invalid_cursor_message)
+        return modified, pk
+
+    def get_paginated_response(self, data):
+        if not self.keyset:
+            return super().get_paginated_response(data)
+        url = self.request.build_absolute_uri()
+        next_url = None
+        if self.has_next:
+            next_url = replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.last))
+        return Response({
+            'results': data,
+            'meta': {
+                'pagination': OrderedDict([
+                    ('size', self.page_size),
+                ]),
+            },
+            'links': OrderedDict([
+                ('first', replace_query_param(url, self.cursor_query_param, '')),
+                ('next', next_url),
+            ]),
+        })
+
+
+class JsonApiSequencePagination(JsonApiPageNumberPagination):
+    """Pages of a feed ordered on its sequence number, with no COUNT.
+
+    Each page is the `page[size]` rows after `filter[seq__gt]`; `links.next`
+    carries the last sequence served, so a consumer only needs to keep that
+    number between polls.  This is only safe because the feed's sequence
+    numbers are handed out in commit order; see `ChangeManager.record`.
+    """
+    sequence_field = 'seq'
+
+    def get_sequence_param(self):
+        return 'filter[{0}__gt]'.format(self.sequence_field)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        rows = list(queryset.order_by(self.sequence_field)[:self.page_size + 1])
+        self.has_next = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        self.last = rows[-1] if rows else None
+        return rows
+
+    def get_paginated_response(self, data):
+        url = self.request.build_absolute_uri()
+        next_url = None
+        if self.has_next:
+            next_url = replace_query_param(
+                url,
+                self.get_sequence_param(),
+                getattr(self.last, self.sequence_field),
+            )
+        return Response({
+            'results': data,
+            'meta': {
+                'pagination': OrderedDict([
+                    ('size', self.page_size),
+                ]),
+            },
+            'links': OrderedDict([
+                ('next', next_url),
+            ]),
+        })
@@ -0,0 +1,161 @@
+# Standard Library
+import logging
+import pickle
+import time
+from collections import Counter
+
+# Third-Party
+from django_rq import get_queue
+from rq.exceptions import NoSuchJobError
+
+# Django
+from django.apps import apps
+
+
+log = logging.getLogger('updater')
+
+# Source name -> (model, batch sync method, source key fields)
+SYNCS = {
+    'human': ('bhs.person', 'update_or_create_from_humans', ['id']),
+    'structure': ('bhs.group', 'update_or_create_from_structures', ['id']),
+    'role': ('bhs.officer', 'update_or_create_from_roles', ['structure_id', 'human_id', 'name']),
+    'join': ('bhs.member', 'update_or_create_from_joins', ['structure__id', 'subscription__human__id']),
+}
+
+# Staged rows outlive a crashed run by at most this long.
+PENDING_TTL = 60 * 60 * 24
+
+
+def get_pending_name(source):
+    return 'bhs:sync:{0}'.format(source)
+
+
+def get_pending_key(source, row):
+    return ':'.join(str(row[field]) for field in SYNCS[source][2])
+
+
+def take_pending(connection, source, keys):
+    """Atomically remove and return the staged rows for `keys`.
+
+    Keys already taken by another job are skipped.
+    """
+    name = get_pending_name(source)
+    pipe = connection.pipeline()
+    pipe.hmget(name, keys)
+    pipe.hdel(name, *keys)
+    payloads, _ = pipe.execute()
+    return [pickle.loads(payload) for payload in payloads if payload is not None]
+
+
+def get_failed_name(source):
+    return 'bhs:sync:failed:{0}'.format(source)
+
+
+def get_server_time(connection):
+    seconds, microseconds = connection.time()
+    return seconds + microseconds / 1e6
+
+
+def record_failure(connection, source):
+    """Note, on the Redis clock, that rows of `source` failed to sync."""
+    connection.set(get_failed_name(source), get_server_time(connection), ex=PENDING_TTL)
+
+
+def get_last_failure(connection, source):
+    value = connection.get(get_failed_name(source))
+    return float(value) if value is not None else None
+
+
+def sync_pending(connection, source, keys):
+    """Sync the latest staged rows for `keys` through the batch manager.
+
+    The rows may have been staged by another, overlapping run, which has
+    no job of its own to watch, so any failure is also recorded where
+    every run's checkpoint logic can see it.
+    """
+    label, method, _ = SYNCS[source]
+    rows = take_pending(connection, source, keys)
+    if not rows:
+        return None
+    manager = apps.get_model(label).objects
+    try:
+        stats = getattr(manager, method)(rows)
+    except Exception:
+        record_failure(connection, source)
+        raise
+    if stats and stats['failed']:
+        record_failure(connection, source)
+    return stats
+
+
+class SyncScheduler(object):
+    """Enqueue a sync in phases, with a barrier between each phase.
+
+    Rows are staged in a Redis hash per source, keyed on the source key,
+    and jobs carry only the keys.  A row enqueued again before its job
+    runs (say, by an overlapping cron run) overwrites the staged payload,
+    so whichever job runs first syncs the latest values and the other
+    finds nothing left to do.
+    """
+
+    def __init__(self, queue='low', poll=1):
+        self.queue = get_queue(queue)
+        self.connection = self.queue.connection
+        self.poll = poll
+        self.jobs = []
+        self.started = get_server_time(self.connection)
+
+    def enqueue(self, source, rows):
+        # Avoid a circular import; the tasks module sets Django up.
+        from .tasks import sync_pending_rows
+        name = get_pending_name(source)
+        keys = []
+        pipe = self.connection.pipeline()
+        for row in rows:
+            key = get_pending_key(source, row)
+            pipe.hset(name, key, pickle.dumps(row))
+            keys.append(key)
+        pipe.expire(name, PENDING_TTL)
+        pipe.execute()
+        self.jobs.append((source, sync_pending_rows.delay(source, keys)))
+
+    def failed_since_start(self, source):
+        """Whether a job of any run failed on `source` since this one began."""
+        failed = get_last_failure(self.connection, source)
+        return failed is not None and failed >= self.started
+
+    def add(self, job, source=None):
+        self.jobs.append((source, job))
+
+    def barrier(self, metrics=None):
+        """Block until every job enqueued since the last barrier is done.
+
+        Returns a Counter of failed jobs by source.  A failed job's rows
+        have already been taken from the staging hash, so they are only
+        synced again if the caller keeps that source's checkpoint where it
+        was; see also `failed_since_start`, for rows this run staged but
+        another run's job took.  The stats returned by sync jobs are added to `metrics`, if
+        given.
+        """
+        pending = self.jobs
+        self.jobs = []
+        failed = Counter()
+        while pending:
+            waiting = []
+            for source, job in pending:
+                try:
+                    job.refresh()
+                except NoSuchJobError:
+                    # Expired or cleaned up, so long done.
+                    continue
+                if job.is_failed:
+                    log.error("Sync job {0} failed".format(job.id))
+                    failed[source] += 1
+                elif not job.is_finished:
+                    waiting.append((source, job))
+                elif metrics and source:
+                    metrics.update(source, job.result)
+            pending = waiting
+            if pending:
+                time.sleep(self.poll)
+        return failed
@@ -9,6 +9,7 @@ from django.core.validators import validate_email
 from phonenumber_field.validators import validate_international_phonenumber
 
 # Local
+from .models import Change
 from .models import Group
 from .models import Person
 
@@ -16,9 +17,25 @@ User = get_user_model()
 validate_url = URLValidator()
 
 
+class ChangeSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Change
+        fields = [
+            'seq',
+            'resource',
+            'object_id',
+            'action',
+            'created',
+        ]
+
+
 class GroupSerializer(serializers.ModelSerializer):
     permissions = DRYPermissionsField()
 
+    included_serializers = {
+        'parent': 'apps.bhs.serializers.GroupSerializer',
+    }
+
     AIC = {
         503061: "Signature",
         500983: "After Hours",
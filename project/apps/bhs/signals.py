@@ -0,0 +1,38 @@
+# Django
+from django.db.models.signals import m2m_changed
+from django.db.models.signals import post_delete
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+# Local
+from .caching import invalidate
+from .models import Change
+from .models import Group
+from .models import Person
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+@receiver(m2m_changed, sender=Group.owners.through)
+def group_changed(sender, **kwargs):
+    invalidate('group')
+
+
+@receiver(post_save, sender=Person)
+@receiver(post_delete, sender=Person)
+@receiver(m2m_changed, sender=Person.owners.through)
+def person_changed(sender, **kwargs):
+    invalidate('person')
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_save, sender=Person)
+def record_save(sender, instance, created, **kwargs):
+    action = Change.ACTION.created if created else Change.ACTION.updated
+    Change.objects.record(sender, action, [instance.pk])
+
+
+@receiver(post_delete, sender=Group)
+@receiver(post_delete, sender=Person)
+def record_delete(sender, instance, **kwargs):
+    Change.objects.record(sender, Change.ACTION.deleted, [instance.pk])
@@ -3,10 +3,14 @@ django.setup()
 
 # Third-Party
 from django_rq import job
+from rq import get_current_connection
 
 # Django
 from django.apps import apps
 
+# Local
+from .scheduler import sync_pending
+
 
 @job('low')
 def create_or_update_group_from_structure(structure):
@@ -14,19 +18,60 @@ def create_or_update_group_from_structure(structure):
     return Group.objects.update_or_create_from_structure(structure)
 
 
+@job('low')
+def create_or_update_groups_from_structures(structures):
+    Group = apps.get_model('bhs.group')
+    return Group.objects.update_or_create_from_structures(structures)
+
+
 @job('low')
 def create_or_update_person_from_human(human):
     Person = apps.get_model('bhs.person')
     return Person.objects.update_or_create_from_human(human)
 
 
+@job('low')
+def create_or_update_persons_from_humans(humans):
+    Person = apps.get_model('bhs.person')
+    return Person.objects.update_or_create_from_humans(humans)
+
+
 @job('low')
 def create_or_update_officer_from_role(role):
     Officer = apps.get_model('bhs.officer')
     return Officer.objects.update_or_create_from_role(role)
 
 
+@job('low')
+def create_or_update_officers_from_roles(roles):
+    Officer = apps.get_model('bhs.officer')
+    return Officer.objects.update_or_create_from_roles(roles)
+
+
 @job('low')
 def create_or_update_member_from_join(join):
     Member = apps.get_model('bhs.member')
     return Member.objects.update_or_create_from_join(join)
+
+
+@job('low')
+def create_or_update_members_from_joins(joins):
+    Member = apps.get_model('bhs.member')
+    return Member.objects.update_or_create_from_joins(joins)
+
+
+@job('low')
+def update_group_owners(pks):
+    Group = apps.get_model('bhs.group')
+    return Group.objects.update_owners(pks)
+
+
+@job('low')
+def update_person_owners(pks):
+    Person = apps.get_model('bhs.person')
+    return Person.objects.update_owners(pks)
+
+
+@job('low')
+def sync_pending_rows(source, keys):
+    return sync_pending(get_current_connection(), source, keys)
@@ -4,6 +4,7 @@ import pytest
 from rest_framework.test import APIClient
 
 # # Django
+from django.core.cache import cache
 from django.test.client import Client
 
 # # Local
@@ -12,6 +13,19 @@ from .factories import PersonFactory
 from .factories import UserFactory
 
 
+@pytest.fixture(autouse=True)
+def local_cache(settings):
+    # Keep cached responses out of the real Redis, and out of other tests.
+    settings.CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        },
+    }
+    cache.clear()
+    yield
+    cache.clear()
+
+
 @pytest.fixture
 def admin_django_client():
     admin = UserFactory(
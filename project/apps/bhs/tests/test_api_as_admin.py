@@ -1,4 +1,7 @@
 
+# Standard Library
+import json
+
 # Third-Party
 import pytest
 from rest_framework import status
@@ -6,6 +9,13 @@ from rest_framework import status
 # Django
 from django.urls import reverse
 
+# First-Party
+from apps.bhs.models import Group
+
+# Local
+from .factories import GroupFactory
+from .factories import PersonFactory
+
 pytestmark = pytest.mark.django_db
 
 
@@ -29,3 +39,91 @@ def test_person_endpoint(admin_api_client, person, django_assert_max_num_queries
         path = reverse('person-detail', args=(str(person.id),))
         response = admin_api_client.get(path)
         assert response.status_code == status.HTTP_200_OK
+
+
+def test_group_list_cache(admin_api_client, group, django_assert_num_queries):
+    path = reverse('group-list')
+    response = admin_api_client.get(path)
+    assert response.status_code == status.HTTP_200_OK
+    # Only the validator aggregate is queried.
+    with django_assert_num_queries(1):
+        cached = admin_api_client.get(path)
+    assert cached.content == response.content
+    GroupFactory()
+    response = admin_api_client.get(path)
+    assert len(response.json()['data']) == len(cached.json()['data']) + 1
+
+
+def test_group_conditional_get(admin_api_client, group, django_assert_num_queries):
+    path = reverse('group-list')
+    response = admin_api_client.get(path)
+    assert response.status_code == status.HTTP_200_OK
+    etag = response['ETag']
+    # Deletes don't move Max(modified), so lists aren't dated.
+    assert not response.has_header('Last-Modified')
+    with django_assert_num_queries(1):
+        response = admin_api_client.get(path, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    group.save()
+    response = admin_api_client.get(path, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_200_OK
+    path = reverse('group-detail', args=(str(group.id),))
+    response = admin_api_client.get(path)
+    last_modified = response['Last-Modified']
+    response = admin_api_client.get(path, HTTP_IF_NONE_MATCH=response['ETag'])
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    response = admin_api_client.get(path, HTTP_IF_MODIFIED_SINCE=last_modified)
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+
+def test_person_keyset_pages(admin_api_client, django_assert_max_num_queries):
+    persons = PersonFactory.create_batch(5)
+    url = reverse('person-list') + '?page[size]=2&page[cursor]='
+    seen = []
+    while url:
+        with django_assert_max_num_queries(10):
+            response = admin_api_client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        content = response.json()
+        assert 'count' not in content['meta']['pagination']
+        seen.extend(row['id'] for row in content['data'])
+        url = content['links']['next']
+    assert sorted(seen) == sorted(str(person.id) for person in persons)
+
+
+def test_change_feed(admin_api_client, group):
+    url = reverse('change-list') + '?page[size]=1&filter[seq__gt]=0'
+    seen = []
+    while url:
+        response = admin_api_client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        content = response.json()
+        seen.extend(row['attributes']['object_id'] for row in content['data'])
+        url = content['links']['next']
+    assert str(group.id) in seen
+    last = content['data'][-1]['id']
+    pk = str(group.id)
+    group.delete()
+    response = admin_api_client.get(reverse('change-list'), {'filter[seq__gt]': last})
+    content = response.json()
+    assert [row['attributes']['object_id'] for row in content['data']] == [pk]
+
+
+def test_person_export(admin_api_client, django_assert_max_num_queries):
+    persons = PersonFactory.create_batch(5)
+    with django_assert_max_num_queries(10):
+        response = admin_api_client.get(reverse('person-export'))
+        assert response.status_code == status.HTTP_200_OK
+        content = b''.join(response.streaming_content)
+    assert response['Content-Type'] == 'application/x-ndjson'
+    rows = [json.loads(line) for line in content.decode().splitlines()]
+    assert sorted(row['id'] for row in rows) == sorted(str(person.id) for person in persons)
+    assert 'digest' not in rows[0]
+
+
+def test_group_export_filtered(admin_api_client, group):
+    GroupFactory(status=Group.STATUS.inactive)
+    response = admin_api_client.get(reverse('group-export'), {'filter[status]': Group.STATUS.active})
+    assert response.status_code == status.HTTP_200_OK
+    rows = [json.loads(line) for line in b''.join(response.streaming_content).decode().splitlines()]
+    assert [row['id'] for row in rows] == [str(group.id)]
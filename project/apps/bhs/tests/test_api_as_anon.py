@@ -38,3 +38,14 @@ def test_person_endpoint(anon_api_client, person):
     assert response.status_code == status.HTTP_401_UNAUTHORIZED
     response = anon_api_client.delete(path)
     assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+def test_change_endpoint(anon_api_client, group):
+    path = reverse('change-list')
+    response = anon_api_client.get(path)
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+def test_person_export(anon_api_client, person):
+    response = anon_api_client.get(reverse('person-export'))
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
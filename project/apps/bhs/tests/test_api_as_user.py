@@ -25,3 +25,14 @@ def test_person_endpoint(user_api_client, person):
     path = reverse('person-detail', args=(str(person.id),))
     response = user_api_client.get(path)
     assert response.status_code == status.HTTP_200_OK
+
+
+def test_change_endpoint(user_api_client, group):
+    path = reverse('change-list')
+    response = user_api_client.get(path)
+    assert response.status_code == status.HTTP_200_OK
+
+
+def test_person_export(user_api_client, person):
+    response = user_api_client.get(reverse('person-export'))
+    assert response.status_code == status.HTTP_200_OK
@@ -0,0 +1,93 @@
+
+# Third-Party
+import pytest
+from rest_framework import status
+from rest_framework.test import APIClient
+
+# Django
+from django.urls import reverse
+
+# Local
+from .factories import GroupFactory
+from .factories import PersonFactory
+from .factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+# A page is served in a constant number of queries, whatever its size.
+MAX_QUERIES = 12
+
+PAGE_SIZES = [1, 10, 100]
+
+
+@pytest.fixture
+def owner():
+    return UserFactory(
+        is_staff=False,
+    )
+
+
+@pytest.fixture
+def owner_api_client(owner):
+    client = APIClient()
+    client.force_authenticate(user=owner)
+    return client
+
+
+def create_groups(size, owner):
+    parent = GroupFactory()
+    groups = GroupFactory.create_batch(size, parent=parent)
+    for group in groups:
+        group.owners.add(owner)
+    return groups
+
+
+def create_persons(size, owner):
+    persons = PersonFactory.create_batch(size)
+    for person in persons:
+        person.owners.add(owner)
+    return persons
+
+
+@pytest.mark.parametrize('include', [None, 'parent'])
+@pytest.mark.parametrize('size', PAGE_SIZES)
+def test_group_list_queries(admin_api_client, owner, size, include, django_assert_max_num_queries):
+    create_groups(size, owner)
+    params = {'page[size]': size}
+    if include:
+        params['include'] = include
+    with django_assert_max_num_queries(MAX_QUERIES):
+        response = admin_api_client.get(reverse('group-list'), params)
+        assert response.status_code == status.HTTP_200_OK
+    assert len(response.data['results']) == size
+
+
+@pytest.mark.parametrize('include', [None, 'parent'])
+@pytest.mark.parametrize('size', PAGE_SIZES)
+def test_group_list_queries_as_owner(owner_api_client, owner, size, include, django_assert_max_num_queries):
+    create_groups(size, owner)
+    params = {'page[size]': size}
+    if include:
+        params['include'] = include
+    with django_assert_max_num_queries(MAX_QUERIES):
+        response = owner_api_client.get(reverse('group-list'), params)
+        assert response.status_code == status.HTTP_200_OK
+    assert len(response.data['results']) == size
+
+
+@pytest.mark.parametrize('size', PAGE_SIZES)
+def test_person_list_queries(admin_api_client, owner, size, django_assert_max_num_queries):
+    create_persons(size, owner)
+    with django_assert_max_num_queries(MAX_QUERIES):
+        response = admin_api_client.get(reverse('person-list'), {'page[size]': size})
+        assert response.status_code == status.HTTP_200_OK
+    assert len(response.data['results']) == size
+
+
+@pytest.mark.parametrize('size', PAGE_SIZES)
+def test_person_list_queries_as_owner(owner_api_client, owner, size, django_assert_max_num_queries):
+    create_persons(size, owner)
+    with django_assert_max_num_queries(MAX_QUERIES):
+        response = owner_api_client.get(reverse('person-list'), {'page[size]': size})
+        assert response.status_code == status.HTTP_200_OK
+    assert len(response.data['results']) == size
@@ -0,0 +1,197 @@
+# Standard Library
+import datetime
+import uuid
+
+# Third-Party
+import pytest
+
+# Django
+from django.apps import apps
+
+# First-Party
+from apps.bhs.managers import bulk_update_or_create
+from apps.bhs.managers import find_orphans
+from apps.bhs.managers import get_digest
+from apps.bhs.models import Change
+from apps.bhs.models import Group
+from apps.bhs.models import Officer
+from apps.bhs.models import Person
+
+# Local
+from .factories import GroupFactory
+from .factories import PersonFactory
+from .factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def test_local_save_clears_digest():
+    person = PersonFactory(digest='a' * 40)
+    person = Person.objects.get(id=person.id)
+    person.deactivate()
+    person.save()
+    person.refresh_from_db()
+    assert person.digest == ''
+
+
+def test_digest_compared_per_row():
+    first, second = PersonFactory.create_batch(2)
+    # The first row happens to hold the digest of the second's new values.
+    Person.objects.filter(id=first.id).update(digest=get_digest({'first_name': 'Changed'}))
+    defaults = {
+        first.id: {'first_name': 'Other'},
+        second.id: {'first_name': 'Changed'},
+    }
+    stats, _ = bulk_update_or_create(Person.objects, defaults)
+    assert stats['unchanged'] == 0
+    second.refresh_from_db()
+    assert second.first_name == 'Changed'
+
+
+TODAY = datetime.date(2026, 1, 1)
+
+
+def make_join(**kwargs):
+    row = {
+        'structure__id': 'structure',
+        'subscription__human__id': 'human',
+        'id': 1,
+        'part': 'lead',
+        'modified': datetime.datetime(2025, 1, 1),
+        'inactive_date': datetime.date(2025, 6, 1),
+        'subscription__current_through': datetime.date(2025, 6, 1),
+        'established_date': datetime.date(2020, 1, 1),
+        'structure__kind': 'quartet',
+        'is_eligible': True,
+        'is_changed': True,
+    }
+    row.update(kwargs)
+    return row
+
+
+def reduce_joins(rows):
+    return apps.get_model('source.join').objects.reduce_joins(rows, TODAY)
+
+
+def test_reduce_joins_open_date_wins():
+    join = reduce_joins([
+        make_join(id=1, subscription__current_through=None),
+        make_join(id=2, subscription__current_through=datetime.date(2030, 1, 1)),
+    ])
+    assert join['endest_date'] is None
+    assert join['status'] == 10
+    join = reduce_joins([
+        make_join(id=1, structure__kind='chorus', inactive_date=datetime.date(2024, 1, 1)),
+        make_join(id=2, structure__kind='chorus', inactive_date=datetime.date(2025, 1, 1)),
+    ])
+    assert join['endest_date'] == datetime.date(2025, 1, 1)
+    assert join['status'] == -10
+
+
+def test_reduce_joins_eligible_only():
+    join = reduce_joins([
+        make_join(id=1, established_date=datetime.date(2021, 1, 1)),
+        make_join(id=9, established_date=datetime.date(2010, 1, 1), is_eligible=False),
+    ])
+    assert join['id'] == 1
+    assert join['startest_date'] == datetime.date(2021, 1, 1)
+    assert reduce_joins([make_join(is_eligible=False)]) is None
+    assert reduce_joins([make_join(is_changed=False)]) is None
+
+
+def test_reduce_joins_latest_part():
+    join = reduce_joins([
+        make_join(id=1, part='tenor', modified=datetime.datetime(2025, 1, 1)),
+        make_join(id=2, part='bass', modified=datetime.datetime(2025, 3, 1)),
+        make_join(id=3, part='lead', modified=None),
+    ])
+    assert join['vocal_part'] == 'bass'
+
+
+def test_find_orphans():
+    local = [((1,), 'a'), ((2,), 'b'), ((3,), 'c'), ((5,), 'e')]
+    assert list(find_orphans(local, [(2,), (3,)])) == ['a', 'e']
+
+
+def test_find_orphans_duplicate_source_keys():
+    local = [((1,), 'a'), ((2,), 'b'), ((3,), 'c')]
+    assert list(find_orphans(local, [(1,), (1,), (3,), (3,)])) == ['b']
+
+
+def test_find_orphans_past_end_of_source():
+    local = [((1,), 'a'), ((7,), 'g'), ((8,), 'h')]
+    assert list(find_orphans(local, [(1,)])) == ['g', 'h']
+    assert list(find_orphans(local, [])) == ['a', 'g', 'h']
+
+
+def test_delete_orphans():
+    kept, orphan = PersonFactory.create_batch(2)
+    assert Person.objects.delete_orphans(iter([])) == 0
+    assert Person.objects.count() == 2
+    assert Person.objects.delete_orphans(iter([(str(kept.id),)])) == 1
+    assert list(Person.objects.values_list('id', flat=True)) == [kept.id]
+
+
+def test_officer_orphans_drop_owners():
+    person = PersonFactory(email='officer@example.com')
+    user = UserFactory(email='officer@example.com')
+    group = GroupFactory()
+    Officer.objects.create(group=group, person=person, office=Officer.OFFICE.manager)
+    Group.objects.update_owners([group.id])
+    assert list(group.owners.all()) == [user]
+    source = iter([(str(uuid.uuid4()), str(uuid.uuid4()))])
+    assert Officer.objects.delete_orphans(source) == 1
+    assert not group.owners.exists()
+
+
+def test_person_orphans_drop_owners():
+    person = PersonFactory(email='officer@example.com')
+    UserFactory(email='officer@example.com')
+    group = GroupFactory()
+    Officer.objects.create(group=group, person=person, office=Officer.OFFICE.manager)
+    Group.objects.update_owners([group.id])
+    assert Person.objects.delete_orphans(iter([(str(uuid.uuid4()),)])) == 1
+    assert not group.owners.exists()
+
+
+def test_update_owners_adds_owner():
+    person = PersonFactory(email='owner@example.com')
+    user = UserFactory(email='owner@example.com')
+    assert Person.objects.update_owners([person.id]) == 1
+    assert list(person.owners.all()) == [user]
+    # Nothing left to change on a second pass.
+    assert Person.objects.update_owners([person.id]) == 0
+
+
+def test_update_owners_removes_owner():
+    person = PersonFactory(email='owner@example.com')
+    UserFactory(email='owner@example.com')
+    Person.objects.update_owners([person.id])
+    Person.objects.filter(id=person.id).update(email='moved@example.com')
+    assert Person.objects.update_owners([person.id]) == 1
+    assert not person.owners.exists()
+
+
+def test_update_owners_bumps_changed_rows_only():
+    owned = PersonFactory(email='owner@example.com')
+    other = PersonFactory(email='nobody@example.com')
+    UserFactory(email='owner@example.com')
+    past = datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc)
+    Person.objects.update(modified=past)
+    Person.objects.update_owners([owned.id, other.id])
+    owned.refresh_from_db()
+    other.refresh_from_db()
+    assert owned.modified > past
+    assert other.modified == past
+
+
+def test_update_owners_records_changes():
+    owned = PersonFactory(email='owner@example.com')
+    other = PersonFactory(email='nobody@example.com')
+    UserFactory(email='owner@example.com')
+    Person.objects.update_owners([owned.id, other.id])
+    updates = Change.objects.filter(
+        resource=Change.RESOURCE.person,
+        action=Change.ACTION.updated,
+    )
+    assert list(updates.values_list('object_id', flat=True)) == [owned.id]
@@ -0,0 +1,445 @@
+# Standard Library
+from functools import lru_cache
+
+# Django
+from django.apps import apps
+
+# Local
+from .validators import validate_email
+from .validators import validate_phone
+from .validators import validate_url
+
+# Association of International Champions, by BHS ID
+AIC = {
+    503061: "Signature",
+    500983: "After Hours",
+    501972: "Main Street",
+    501329: "Forefront",
+    500922: "Instant Classic",
+    304772: "Musical Island Boys",
+    500000: "Masterpiece",
+    501150: "Ringmasters",
+    317293: "Old School",
+    286100: "Storm Front",
+    500035: "Crossroads",
+    297201: "OC Times",
+    299233: "Max Q",
+    302244: "Vocal Spectrum",
+    299608: "Realtime",
+    6158: "Gotcha!",
+    2496: "Power Play",
+    276016: "Four Voices",
+    5619: "Michigan Jake",
+    6738: "Platinum",
+    3525: "FRED",
+    5721: "Revival",
+    2079: "Yesteryear",
+    2163: "Nightlife",
+    4745: "Marquis",
+    3040: "Joker's Wild",
+    1259: "Gas House Gang",
+    2850: "Keepsake",
+    1623: "The Ritz",
+    3165: "Acoustix",
+    1686: "Second Edition",
+    492: "Chiefs of Staff",
+    1596: "Interstate Rivals",
+    1654: "Rural Route 4",
+    406: "The New Tradition",
+    1411: "Rapscallions",
+    1727: "Side Street Ramblers",
+    545: "Classic Collection",
+    490: "Chicago News",
+    329: "Boston Common",
+    4034: "Grandma's Boys",
+    318: "Bluegrass Student Union",
+    362: "Most Happy Fellows",
+    1590: "Innsiders",
+    1440: "Happiness Emporium",
+    1427: "Regents",
+    627: "Dealer's Choice",
+    1288: "Golden Staters",
+    1275: "Gentlemen's Agreement",
+    709: "Oriole Four",
+    711: "Mark IV",
+    2047: "Western Continentals",
+    1110: "Four Statesmen",
+    713: "Auto Towners",
+    715: "Four Renegades",
+    1729: "Sidewinders",
+    718: "Town and Country 4",
+    719: "Gala Lads",
+    1871: "The Suntones",
+    722: "Evans Quartet",
+    724: "Four Pitchikers",
+    726: "Gaynotes",
+    729: "Lads of Enchantment",
+    731: "Confederates",
+    732: "Four Hearsemen",
+    736: "The Orphans",
+    739: "Vikings",
+    743: "Four Teens",
+    746: "Schmitt Brothers",
+    748: "Buffalo Bills",
+    750: "Mid-States Four",
+    753: "Pittsburghers",
+    756: "Doctors of Harmony",
+    759: "Garden State Quartet",
+    761: "Misfits",
+    764: "Harmony Halls",
+    766: "Four Harmonizers",
+    770: "Elastic Four",
+    773: "Chord Busters",
+    775: "Flat Foot Four",
+    776: "Bartlsesville Barflies",
+}
+
+
+@lru_cache(maxsize=None)
+def get_group_lookups():
+    """Build the source-to-Group choice tables once per process."""
+    Group = apps.get_model('bhs.group')
+    return {
+        'kind': {
+            'quartet': Group.KIND.quartet,
+            'chorus': Group.KIND.chorus,
+            'chapter': Group.KIND.chapter,
+            'group': Group.KIND.noncomp,
+            'district': Group.KIND.district,
+            'organization': Group.KIND.international,
+        },
+        'gender': {
+            'men': Group.GENDER.male,
+            'women': Group.GENDER.female,
+            'mixed': Group.GENDER.mixed,
+        },
+        'district': {
+            'BHS': Group.DISTRICT.bhs,
+            'CAR': Group.DISTRICT.car,
+            'CSD': Group.DISTRICT.csd,
+            'DIX': Group.DISTRICT.dix,
+            'EVG': Group.DISTRICT.evg,
+            'FWD': Group.DISTRICT.fwd,
+            'ILL': Group.DISTRICT.ill,
+            'JAD': Group.DISTRICT.jad,
+            'LOL': Group.DISTRICT.lol,
+            'MAD': Group.DISTRICT.mad,
+            'NED': Group.DISTRICT.ned,
+            'NSC': Group.DISTRICT.nsc,
+            'ONT': Group.DISTRICT.ont,
+            'PIO': Group.DISTRICT.pio,
+            'RMD': Group.DISTRICT.rmd,
+            'SLD': Group.DISTRICT.sld,
+            'SUN': Group.DISTRICT.sun,
+            'SWD': Group.DISTRICT.swd,
+        },
+        'division': {
+            'EVG Division I': Group.DIVISION.evgd1,
+            'EVG Division II': Group.DIVISION.evgd2,
+            'EVG Division III': Group.DIVISION.evgd3,
+            'EVG Division IV': Group.DIVISION.evgd4,
+            'EVG Division V': Group.DIVISION.evgd5,
+            'FWD Arizona': Group.DIVISION.fwdaz,
+            'FWD Northeast': Group.DIVISION.fwdne,
+            'FWD Northwest': Group.DIVISION.fwdnw,
+            'FWD Southeast': Group.DIVISION.fwdse,
+            'FWD Southwest': Group.DIVISION.fwdsw,
+            'LOL 10000 Lakes': Group.DIVISION.lol10l,
+            'LOL Division One': Group.DIVISION.lolone,
+            'LOL Northern Plains': Group.DIVISION.lolnp,
+            'LOL Packerland': Group.DIVISION.lolpkr,
+            'LOL Southwest': Group.DIVISION.lolsw,
+            'MAD Central': Group.DIVISION.madcen,
+            'MAD Northern': Group.DIVISION.madnth,
+            'MAD Southern': Group.DIVISION.madsth,
+            'NED Granite and Pine': Group.DIVISION.nedgp,
+            'NED Mountain': Group.DIVISION.nedmtn,
+            'NED Patriot': Group.DIVISION.nedpat,
+            'NED Sunrise': Group.DIVISION.nedsun,
+            'NED Yankee': Group.DIVISION.nedyke,
+            'SWD Northeast': Group.DIVISION.swdne,
+            'SWD Northwest': Group.DIVISION.swdnw,
+            'SWD Southeast': Group.DIVISION.swdse,
+            'SWD Southwest': Group.DIVISION.swdsw,
+        },
+    }
+
+
+def normalize_human(human, Person=None):
+    """Transform one exported Human into Person field values."""
+    if Person is None:
+        Person = apps.get_model('bhs.person')
+
+    # Extract
+    first_name = human['first_name']
+    middle_name = human['middle_name']
+    last_name = human['last_name']
+    nick_name = human['nick_name']
+    email = human['email']
+    birth_date = human['birth_date']
+    home_phone = human['home_phone']
+    cell_phone = human['cell_phone']
+    work_phone = human['work_phone']
+    bhs_id = human['bhs_id']
+    gender = human['gender']
+    part = human['part']
+    mon = human['mon']
+    is_deceased = human['is_deceased']
+    # is_honorary = human['is_honorary']
+    # is_suspended = human['is_suspended']
+    # is_expelled = human['is_expelled']
+    status = human['status']
+    current_through = human['current_through']
+
+    # Transform
+    _, prefix, first_name = first_name.rpartition('Dr.')
+    last_name, suffix, _ = last_name.partition('II')
+    last_name, suffix, _ = last_name.partition('II')
+    last_name, suffix, _ = last_name.partition('DDS')
+    last_name, suffix, _ = last_name.partition('M.D.')
+    if last_name.endswith('Sr'):
+        last_name, suffix, _ = last_name.partition('Sr')
+    if last_name.endswith('Jr'):
+        last_name, suffix, _ = last_name.partition('Jr')
+
+    if nick_name == first_name:
+        nick_name = ""
+
+    if prefix:
+        prefix = prefix.strip()
+
+    middle_name = middle_name or ""
+    nick_name = nick_name or ""
+
+    if suffix:
+        suffix = suffix.strip()
+
+    home_phone = validate_phone(home_phone)
+    cell_phone = validate_phone(cell_phone)
+    work_phone = validate_phone(work_phone)
+
+    email = validate_email(email)
+
+    gender = getattr(Person.GENDER, gender, None) if gender else None
+    part = getattr(Person.PART, part, None) if part else None
+
+    is_deceased = bool(is_deceased)
+
+    return {
+        'status': status,
+        'prefix': prefix,
+        'first_name': first_name,
+        'middle_name': middle_name,
+        'last_name': last_name,
+        'suffix': suffix,
+        'nick_name': nick_name,
+        'email': email,
+        'birth_date': birth_date,
+        'home_phone': home_phone,
+        'cell_phone': cell_phone,
+        'work_phone': work_phone,
+        'bhs_id': bhs_id,
+        'gender': gender,
+        'part': part,
+        'is_deceased': is_deceased,
+        'mon': mon,
+        'current_through': current_through,
+    }
+
+
+def normalize_humans(humans):
+    """Transform a chunk of exported Humans into Person rows.
+
+    Each row is the Person field values plus the source `id`.
+    """
+    Person = apps.get_model('bhs.person')
+    rows = []
+    for human in humans:
+        if not isinstance(human, dict):
+            raise ValueError("Must be dictionary")
+        row = normalize_human(human, Person)
+        row['id'] = human['id']
+        rows.append(row)
+    return rows
+
+
+def normalize_structure(structure, lookups=None):
+    """Transform one exported Structure into Group field values."""
+    if lookups is None:
+        lookups = get_group_lookups()
+    Group = apps.get_model('bhs.group')
+
+    # Extract
+    name = structure['name']
+    status = structure['status_real']
+    kind = structure['kind']
+    gender = structure['gender']
+    district = structure['district']
+    division = structure['division']
+    bhs_id = structure['bhs_id']
+    legacy_code = structure['chapter_code']
+    website = structure['website']
+    email = structure['email']
+    main_phone = structure['phone']
+    fax_phone = structure['fax']
+    facebook = structure['facebook']
+    twitter = structure['twitter']
+    youtube = structure['youtube']
+    pinterest = structure['pinterest']
+    flickr = structure['flickr']
+    instagram = structure['instagram']
+    soundcloud = structure['soundcloud']
+    preferred_name = structure['preferred_name']
+    visitor_information = structure['visitor_information']
+    established_date = structure['established_date']
+
+    # Re-construct dangling article
+    name = name.strip() if name else ""
+    parsed = name.partition(", The")
+    name = "The {0}".format(parsed[0]) if parsed[1] else parsed[0]
+
+    preferred_name = "{0} (NAME APPROVAL PENDING)".format(preferred_name.strip()) if preferred_name else ''
+    name = name if name else preferred_name
+
+    if not name:
+        name = "(UNKNOWN)"
+
+    # Overwrite status and name for AIC
+    if bhs_id in AIC:
+        status = Group.STATUS.aic
+    name = AIC.get(bhs_id, name)
+
+    kind = lookups['kind'].get(kind, None)
+
+    legacy_code = legacy_code if legacy_code else ""
+
+    gender = lookups['gender'].get(gender, Group.GENDER.male)
+    district = lookups['district'].get(district, None)
+    division = lookups['division'].get(division, None)
+
+    website = validate_url(website)
+    facebook = validate_url(facebook)
+    twitter = validate_url(twitter)
+    youtube = validate_url(youtube)
+    pinterest = validate_url(pinterest)
+    flickr = validate_url(flickr)
+    instagram = validate_url(instagram)
+    soundcloud = validate_url(soundcloud)
+
+    phone = validate_phone(main_phone)
+    fax_phone = validate_phone(fax_phone)
+
+    email = validate_email(email)
+
+    visitor_information = visitor_information.strip() if visitor_information else ''
+
+    return {
+        'status': status,
+        'name': name,
+        'kind': kind,
+        'gender': gender,
+        'district': district,
+        'division': division,
+        'bhs_id': bhs_id,
+        'code': legacy_code,
+        'website': website,
+        'email': email,
+        'phone': phone,
+        'fax_phone': fax_phone,
+        'facebook': facebook,
+        'twitter': twitter,
+        'youtube': youtube,
+        'pinterest': pinterest,
+        'flickr': flickr,
+        'instagram': instagram,
+        'soundcloud': soundcloud,
+        'visitor_information': visitor_information,
+        'start_date': established_date,
+        # 'parent': parent,
+    }
+
+
+def normalize_structures(structures):
+    """Transform a chunk of exported Structures into Group rows.
+
+    Each row is the Group field values plus the source `id`.
+    """
+    lookups = get_group_lookups()
+    rows = []
+    for structure in structures:
+        if not isinstance(structure, dict):
+            raise ValueError("Must be dict")
+        row = normalize_structure(structure, lookups)
+        row['id'] = structure['id']
+        rows.append(row)
+    return rows
+
+
+def normalize_role(role):
+    """Transform one exported Role into Officer field values."""
+    return {
+        'status': role['status'],
+        'start_date': role['startest_date'],
+        'end_date': role['endest_date'],
+    }
+
+
+def normalize_roles(roles):
+    """Transform a chunk of exported Roles into Officer rows.
+
+    Each row is the Officer field values plus the source `group_id` and
+    `person_id`.
+    """
+    rows = []
+    for role in roles:
+        if not isinstance(role, dict):
+            raise RuntimeError("Must be pre-processed")
+        row = normalize_role(role)
+        row['group_id'] = role['structure_id']
+        row['person_id'] = role['human_id']
+        rows.append(row)
+    return rows
+
+
+def normalize_join(join, Member=None):
+    """Transform one exported Join into Member field values."""
+    if Member is None:
+        Member = apps.get_model('bhs.member')
+
+    # Extract
+    start_date = join['startest_date']
+    end_date = join['endest_date']
+    vocal_part = join['vocal_part']
+    status = join['status']
+
+    # Transform
+    part = getattr(
+        Member.PART,
+        vocal_part.strip().lower() if vocal_part else '',
+        None,
+    )
+
+    return {
+        'status': status,
+        'start_date': start_date,
+        'end_date': end_date,
+        'part': part,
+    }
+
+
+def normalize_joins(joins):
+    """Transform a chunk of exported Joins into Member rows.
+
+    Each row is the Member field values plus the source `group_id` and
+    `person_id`.
+    """
+    Member = apps.get_model('bhs.member')
+    rows = []
+    for join in joins:
+        if not isinstance(join, dict):
+            raise RuntimeError("Must be pre-validated")
+        row = normalize_join(join, Member)
+        row['group_id'] = join['structure__id']
+        row['person_id'] = join['subscription__human__id']
+        rows.append(row)
+    return rows
@@ -3,6 +3,7 @@
 from rest_framework import routers
 
 # Local
+from .views import ChangeViewSet
 from .views import GroupViewSet
 from .views import PersonViewSet
 
@@ -10,6 +11,7 @@ router = routers.DefaultRouter(
     trailing_slash=False,
 )
 
+router.register(r'change', ChangeViewSet)
 router.register(r'group', GroupViewSet)
 router.register(r'person', PersonViewSet)
 
@@ -1,5 +1,6 @@
 # Standard Library
 from datetime import date
+from functools import lru_cache
 from uuid import UUID
 
 # Django
@@ -31,17 +32,22 @@ validate_tin = RegexValidator(
     """,
 )
 
+PUNCTUATION = str.maketrans('', '', '!"#$%&()*+,./:;<=>?@[\\]^_`{|}~')
+
+url_validator = URLValidator()
+
+# Synced values recur run after run, so the sync validators are memoized.
+CACHE_SIZE = 2 ** 16
+
 def validate_punctuation(value):
     if not value:
         return ""
-    return value.translate(
-        value.maketrans('', '', '!"#$%&()*+,./:;<=>?@[\\]^_`{|}~')
-    ).strip()
+    return value.translate(PUNCTUATION).strip()
 
+@lru_cache(maxsize=CACHE_SIZE)
 def validate_url(value):
-    validator = URLValidator()
     try:
-        validator(value)
+        url_validator(value)
     except ValidationError:
         return ''
     return value.lower()
@@ -52,6 +58,7 @@ def validate_uuid(value):
     except ValueError as e:
         raise e
 
+@lru_cache(maxsize=CACHE_SIZE)
 def validate_phone(value):
     try:
         validate_international_phonenumber(value)
@@ -60,9 +67,23 @@ def validate_phone(value):
     return value if value else ""
 
 
+@lru_cache(maxsize=CACHE_SIZE)
 def validate_email(value):
     try:
         val_email(value)
     except ValidationError:
         return ""
-    return value.lower()
\ No newline at end of file
+    return value.lower()
+
+def get_cache_info():
+    info = {}
+    for validator in [validate_phone, validate_email, validate_url]:
+        stats = validator.cache_info()
+        lookups = stats.hits + stats.misses
+        info[validator.__name__] = {
+            'hits': stats.hits,
+            'misses': stats.misses,
+            'size': stats.currsize,
+            'hit_rate': stats.hits / lookups if lookups else 0.0,
+        }
+    return info
@@ -1,31 +1,81 @@
 from rest_framework_json_api import views
 
+from .filtersets import ChangeFilterset
 from .filtersets import GroupFilterset
 from .filtersets import PersonFilterset
+from .mixins import CachedListMixin
+from .mixins import ConditionalMixin
+from .mixins import ExportMixin
+from .models import Change
 from .models import Group
 from .models import Person
+from .models import get_role_names
+from .pagination import JsonApiKeysetPagination
+from .pagination import JsonApiSequencePagination
 
+from .serializers import ChangeSerializer
 from .serializers import GroupSerializer
 from .serializers import PersonSerializer
 
 
-class GroupViewSet(views.ModelViewSet):
+class ChangeViewSet(views.ReadOnlyModelViewSet):
+    queryset = Change.objects.all()
+    serializer_class = ChangeSerializer
+    filterset_class = ChangeFilterset
+    pagination_class = JsonApiSequencePagination
+    ordering = [
+        'seq',
+    ]
+    resource_name = "change"
+
+
+class GroupViewSet(ExportMixin, ConditionalMixin, CachedListMixin, views.ModelViewSet):
     queryset = Group.objects.all()
     serializer_class = GroupSerializer
     filterset_class = GroupFilterset
+    pagination_class = JsonApiKeysetPagination
     ordering_fields = '__all__'
     ordering = [
         'id',
     ]
     resource_name = "group"
 
+    def get_queryset(self):
+        return super().get_queryset().select_related(
+            'parent',
+        ).prefetch_related(
+            'owners',
+        )
 
-class PersonViewSet(views.ModelViewSet):
+    def get_cache_tier(self, request):
+        tier = super().get_cache_tier(request)
+        if tier == 'staff':
+            return tier
+        roles = get_role_names(request) & {'SCJC', 'DRCJ', 'Librarian', 'Manager'}
+        # These roles can write every Group, whoever owns it.
+        if roles >= {'SCJC'} or roles >= {'Manager'}:
+            return 'manager'
+        return ":".join([tier] + sorted(roles))
+
+
+class PersonViewSet(ExportMixin, ConditionalMixin, CachedListMixin, views.ModelViewSet):
     queryset = Person.objects.all()
     serializer_class = PersonSerializer
     filterset_class = PersonFilterset
+    pagination_class = JsonApiKeysetPagination
     ordering_fields = '__all__'
     ordering = [
         'id',
     ]
     resource_name = "person"
+
+    def get_queryset(self):
+        return super().get_queryset().prefetch_related(
+            'owners',
+        )
+
+    def get_cache_tier(self, request):
+        # Only staff can write Persons; everyone else sees the same thing.
+        if request.user.is_staff or request.user.is_superuser:
+            return 'staff'
+        return 'user'
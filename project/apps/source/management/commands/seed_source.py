@@ -0,0 +1,337 @@
+# Standard Library
+import datetime
+import random
+import uuid
+
+# Django
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+from django.db import connections
+from django.db import models
+from django.utils import timezone
+
+
+DISTRICTS = [
+    'CAR', 'CSD', 'DIX', 'EVG', 'FWD', 'ILL', 'JAD', 'LOL', 'MAD',
+    'NED', 'NSC', 'ONT', 'PIO', 'RMD', 'SLD', 'SUN', 'SWD',
+]
+PARTS = ['tenor', 'lead', 'baritone', 'bass', '']
+FIRST_NAMES = ['Jim', 'Bob', 'Pat', 'Sam', 'Dr. Lee', 'Chris', 'Alex', 'Terry']
+LAST_NAMES = ['Smith', 'Jones II', 'Brown Jr', 'Miller', 'Davis', 'Garcia', 'Wilson']
+ROLES = ['President', 'Secretary', 'Treasurer', 'Chapter President', 'Quartet Admin']
+
+# Creation order, parents first.
+MODELS = [
+    'source.status',
+    'source.structure',
+    'source.human',
+    'source.membership',
+    'source.subscription',
+    'source.role',
+    'source.join',
+    'source.address',
+]
+
+
+def make_id(rng):
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def make_date(rng, start, end):
+    return datetime.date(rng.randint(start, end), rng.randint(1, 12), rng.randint(1, 28))
+
+
+def make_phone(rng):
+    return "({0}) {1}-{2:04d}".format(rng.randint(201, 989), rng.randint(200, 999), rng.randint(0, 9999))
+
+
+def build(model, **values):
+    """Instantiate `model`, filling required columns the seed doesn't care about."""
+    for field in model._meta.concrete_fields:
+        if field.name in values or field.attname in values:
+            continue
+        if field.null:
+            values[field.attname] = None
+        elif isinstance(field, models.BooleanField):
+            values[field.attname] = False
+        elif isinstance(field, (models.IntegerField, models.FloatField)):
+            values[field.attname] = 0
+        elif isinstance(field, models.DateTimeField):
+            values[field.attname] = timezone.now()
+        elif isinstance(field, models.DateField):
+            values[field.attname] = datetime.date.today()
+        else:
+            values[field.attname] = ''
+    return model(**values)
+
+
+class Command(BaseCommand):
+    help = "Create the source views as tables in a local database and seed them."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--database',
+            dest='database',
+            required=True,
+            help='Database alias to seed.  Never point this at the BHS database.',
+        )
+
+        parser.add_argument(
+            '--humans',
+            type=int,
+            dest='humans',
+            default=200000,
+            help='Number of Humans to create.',
+        )
+
+        parser.add_argument(
+            '--chapters',
+            type=int,
+            dest='chapters',
+            default=40,
+            help='Number of Chapters per District.',
+        )
+
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            dest='batch_size',
+            default=5000,
+            help='Number of rows to insert per query.',
+        )
+
+        parser.add_argument(
+            '--seed',
+            type=int,
+            dest='seed',
+            default=0,
+            help='Seed for the generated data.',
+        )
+
+        parser.add_argument(
+            '--drop',
+            action='store_true',
+            dest='drop',
+            help='Drop existing tables first.',
+        )
+
+    def handle(self, *args, **options):
+        self.database = options['database']
+        self.batch_size = options['batch_size']
+        self.rng = random.Random(options['seed'])
+        self.now = timezone.now()
+
+        self.create_tables(options['drop'])
+        statuses = self.seed_statuses()
+        structures = self.seed_structures(statuses, options['chapters'], options['humans'])
+        self.seed_humans(structures, options['humans'])
+        self.seed_roles(structures)
+        self.stdout.write("Complete.")
+
+    def create_tables(self, drop):
+        connection = connections[self.database]
+        existing = set(connection.introspection.table_names(include_views=True))
+        with connection.cursor() as cursor:
+            views = {
+                info.name
+                for info in connection.introspection.get_table_list(cursor)
+                if info.type == 'v'
+            }
+        sources = [apps.get_model(label) for label in MODELS]
+        found = [model._meta.db_table for model in sources if model._meta.db_table in existing]
+        # The real source serves these as views; never touch it.
+        if views & set(found):
+            raise CommandError("{0} are views, so this looks like the BHS database.  Refusing.".format(
+                ", ".join(sorted(views & set(found))),
+            ))
+        if found and not drop:
+            raise CommandError("Tables already exist: {0}.  Use --drop to replace them.".format(", ".join(found)))
+        with connection.schema_editor() as schema_editor:
+            for model in reversed(sources):
+                if model._meta.db_table in existing:
+                    schema_editor.delete_model(model)
+            for model in sources:
+                schema_editor.create_model(model)
+        self.stdout.write("Created {0} tables.".format(len(sources)))
+
+    def insert(self, objs):
+        if objs:
+            type(objs[0]).objects.using(self.database).bulk_create(objs, batch_size=self.batch_size)
+
+    def modified(self):
+        return self.now - datetime.timedelta(minutes=self.rng.randint(0, 60 * 24 * 730))
+
+    def seed_statuses(self):
+        Status = apps.get_model('source.status')
+        statuses = {
+            name: build(Status, id=make_id(self.rng), name=name, label=name.title())
+            for name in ['active', 'active-internal', 'inactive', 'expired']
+        }
+        self.insert(list(statuses.values()))
+        return statuses
+
+    def seed_structures(self, statuses, chapters, humans):
+        """Build the International > District > Chapter > Chorus tree, plus Quartets."""
+        Structure = apps.get_model('source.structure')
+        rng = self.rng
+        bhs_id = iter(range(100000, 10000000))
+        structures = {
+            'organization': [],
+            'district': [],
+            'chapter': [],
+            'chorus': [],
+            'quartet': [],
+        }
+
+        def add(kind, name, parent=None, code='', gender='men'):
+            structure = build(
+                Structure,
+                id=make_id(rng),
+                name=name,
+                kind=kind,
+                gender=gender,
+                bhs_id=next(bhs_id),
+                chapter_code=code,
+                website=rng.choice(["www.{0}.org".format(name.lower().replace(' ', '')), '']),
+                email=rng.choice(["info@{0}.org".format(name.lower().replace(' ', '')), 'n/a', '']),
+                phone=make_phone(rng),
+                established_date=make_date(rng, 1938, 2019),
+                parent=parent,
+                status=statuses[rng.choice(['active'] * 8 + ['active-internal', 'inactive'])],
+                created=self.now,
+                modified=self.modified(),
+            )
+            structures[kind].append(structure)
+            return structure
+
+        root = add('organization', "Barbershop Harmony Society", code='BHS')
+        for district in DISTRICTS:
+            parent = add('district', "{0} District".format(district), parent=root, code=district)
+            for i in range(chapters):
+                code = "{0}{1:03d}".format(district[0], i)
+                chapter = add('chapter', "{0} Chapter {1}".format(district, i), parent=parent, code=code)
+                add('chorus', "Chorus of {0} {1}".format(district, i), parent=chapter, gender=rng.choice(['men', 'women', 'mixed']))
+        for i in range(max(humans // 100, 1)):
+            add('quartet', "Quartet {0}".format(i), parent=rng.choice(structures['district']))
+
+        for kind in structures:
+            self.insert(structures[kind])
+        self.stdout.write("Created {0} Structures.".format(sum(len(items) for items in structures.values())))
+        return structures
+
+    def seed_humans(self, structures, total):
+        """Create Humans with one to three Subscriptions, each joined to a few groups."""
+        Human = apps.get_model('source.human')
+        Membership = apps.get_model('source.membership')
+        Subscription = apps.get_model('source.subscription')
+        Join = apps.get_model('source.join')
+        rng = self.rng
+
+        # One membership per joinable structure
+        groups = structures['chapter'] + structures['chorus'] + structures['quartet']
+        memberships = [
+            build(
+                Membership,
+                id=make_id(rng),
+                object_type='structure',
+                structure=structure,
+                months=12,
+                code='full',
+                effective_date=make_date(rng, 2000, 2019),
+                created=self.now,
+                modified=self.modified(),
+            )
+            for structure in groups
+        ]
+        self.insert(memberships)
+
+        t = 0
+        humans, subscriptions, joins = [], [], []
+        for i in range(total):
+            human = build(
+                Human,
+                id=make_id(rng),
+                username="user{0}".format(i),
+                first_name=rng.choice(FIRST_NAMES),
+                middle_name=rng.choice(['A', 'J', '']),
+                last_name=rng.choice(LAST_NAMES),
+                nick_name=rng.choice(['', '', 'Jimmy']),
+                email="user{0}@example.com".format(i) if rng.random() < 0.85 else '',
+                birth_date=make_date(rng, 1930, 2005),
+                home_phone=make_phone(rng),
+                cell_phone=rng.choice([make_phone(rng), '']),
+                bhs_id=1000000 + i,
+                gender=rng.choice(['male', 'female']),
+                part=rng.choice(PARTS),
+                mon=rng.randint(0, 600),
+                created=self.now,
+                modified=self.modified(),
+            )
+            humans.append(human)
+            for _ in range(rng.choice([1, 1, 2, 3])):
+                subscription = build(
+                    Subscription,
+                    id=make_id(rng),
+                    human=human,
+                    current_through=make_date(rng, 2015, 2030),
+                    items_editable=rng.random() < 0.9,
+                    status='active',
+                    created=self.now,
+                    modified=self.modified(),
+                )
+                subscriptions.append(subscription)
+                for membership in rng.sample(memberships, min(len(memberships), rng.choice([1, 1, 2, 3]))):
+                    joins.append(build(
+                        Join,
+                        id=make_id(rng),
+                        subscription=subscription,
+                        membership=membership,
+                        structure_id=membership.structure_id,
+                        status=True,
+                        established_date=make_date(rng, 1990, 2019),
+                        inactive_date=rng.choice([None, None, make_date(rng, 2015, 2030)]),
+                        paid=rng.random() < 0.95,
+                        part=rng.choice(PARTS),
+                        created=self.now,
+                        modified=self.modified(),
+                    ))
+            if len(humans) >= self.batch_size:
+                t += self.flush(humans, subscriptions, joins)
+                self.stdout.flush()
+                self.stdout.write("Created {0} Humans...".format(t), ending='\r')
+        t += self.flush(humans, subscriptions, joins)
+        self.stdout.write("")
+        self.stdout.write("Created {0} Humans.".format(t))
+
+    def flush(self, *batches):
+        t = len(batches[0])
+        for batch in batches:
+            self.insert(batch)
+            del batch[:]
+        return t
+
+    def seed_roles(self, structures):
+        Human = apps.get_model('source.human')
+        Role = apps.get_model('source.role')
+        rng = self.rng
+        pks = list(Human.objects.using(self.database).values_list('id', flat=True))
+        roles = []
+        for kind in ['district', 'chapter', 'chorus', 'quartet']:
+            for structure in structures[kind]:
+                for name in rng.sample(ROLES, rng.randint(1, 3)):
+                    roles.append(build(
+                        Role,
+                        id=make_id(rng),
+                        object_type='structure',
+                        structure=structure,
+                        name=name,
+                        abbv=name[:10],
+                        start_date=make_date(rng, 1990, 2019),
+                        end_date=rng.choice([None, make_date(rng, 2015, 2030)]),
+                        human_id=rng.choice(pks),
+                        created=self.now,
+                        modified=self.modified(),
+                    ))
+        self.insert(roles)
+        self.stdout.write("Created {0} Roles.".format(len(roles)))
@@ -1,9 +1,14 @@
 
 # Standard Library
 from datetime import date
+from itertools import groupby
+from itertools import islice
 
 # Django
+from django.apps import apps
 from django.contrib.auth import get_user_model
+from django.db import connections
+from django.db.models import BooleanField
 from django.db.models import Case
 from django.db.models import CharField
 from django.db.models import DateField
@@ -15,13 +20,138 @@ from django.db.models import Min
 from django.db.models import OuterRef
 from django.db.models import Q
 from django.db.models import Subquery
+from django.db.models import Value
 from django.db.models import When
 
 
 User = get_user_model()
 
+
+def keyset(keys, values):
+    """Build the filter for rows sorting strictly after `values` on `keys`."""
+    q = Q(**{keys[-1] + '__gt': values[-1]})
+    for key, value in zip(reversed(keys[:-1]), reversed(values[:-1])):
+        q = Q(**{key + '__gt': value}) | (Q(**{key: value}) & q)
+    return q
+
+
+def latest(*values):
+    """Return the most recent of the given timestamps, ignoring missing ones."""
+    values = [value for value in values if value]
+    return max(values) if values else None
+
+
+def paginate(queryset, keys, size):
+    """Yield lists of rows from a values() queryset, one keyset page at a time.
+
+    Each page is a fresh bounded query, so neither the database driver nor
+    the caller ever holds more than `size` rows.
+    """
+    queryset = queryset.order_by(*keys)
+    after = None
+    while True:
+        page = queryset
+        if after:
+            page = page.filter(keyset(keys, after))
+        rows = list(page[:size])
+        if rows:
+            yield rows
+        if len(rows) < size:
+            return
+        after = [rows[-1][key] for key in keys]
+
+
+def chunks(iterable, size):
+    """Yield lists of at most `size` items from any iterable."""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def get_streaming_cursor(connection):
+    """Open a cursor that fetches rows as they are read.
+
+    MySQLdb buffers the whole result on the client unless asked for an
+    unbuffered `SSCursor`; other backends use Django's chunked cursor.
+    """
+    if connection.vendor == 'mysql':
+        # Third-Party
+        from MySQLdb.cursors import SSCursor
+        connection.ensure_connection()
+        return connection.connection.cursor(SSCursor)
+    return connection.chunked_cursor()
+
+
+def stream_values(queryset, size=5000):
+    """Yield every row of a values() queryset from a single query.
+
+    The query runs once, in its own order, and rows are fetched `size` at
+    a time from a server-side cursor, so memory stays flat and the
+    database sorts the result only once.  Nothing else may be run on the
+    connection until the stream is exhausted or closed.
+    """
+    query = queryset.query
+    compiler = query.get_compiler(using=queryset.db)
+    sql, params = compiler.as_sql()
+    names = [*query.extra_select, *query.values_select, *query.annotation_select]
+    cursor = get_streaming_cursor(connections[queryset.db])
+    try:
+        cursor.execute(sql, params)
+        chunks = iter(lambda: list(cursor.fetchmany(size)), [])
+        for row in compiler.results_iter(chunks):
+            yield dict(zip(names, row))
+    finally:
+        cursor.close()
+
+
+def within(queryset, bounds):
+    """Restrict a queryset to `field` values in `[lower, upper)`.
+
+    `bounds` is `(field, lower, upper)`; either end may be None.
+    """
+    if not bounds:
+        return queryset
+    field, lower, upper = bounds
+    if lower is not None:
+        queryset = queryset.filter(**{field + '__gte': lower})
+    if upper is not None:
+        queryset = queryset.filter(**{field + '__lt': upper})
+    return queryset
+
+
+def stream(queryset, keys, size):
+    """Yield the `keys` of every row as tuples, in key order.
+
+    Only the key columns are selected, a keyset page at a time.
+    """
+    for rows in paginate(queryset.values(*keys), keys, size):
+        for row in rows:
+            yield tuple(row[key] for key in keys)
+
+
 class HumanManager(Manager):
+    export_keys = ['id']
+
     def export_values(self, cursor=None, pk=None):
+        return list(self.get_export_queryset(cursor=cursor, pk=pk))
+
+    def export_pages(self, cursor=None, size=1000, bounds=None):
+        return paginate(within(self.get_export_queryset(cursor=cursor), bounds), self.export_keys, size)
+
+    def export_ids(self, size=5000):
+        return stream(self.get_export_queryset(), self.export_keys, size)
+
+    def get_high_water_mark(self):
+        Subscription = apps.get_model('source.subscription')
+        return latest(
+            self.aggregate(modified=Max('modified'))['modified'],
+            Subscription.objects.aggregate(modified=Max('modified'))['modified'],
+        )
+
+    def get_export_queryset(self, cursor=None, pk=None):
         today = date.today()
         hs = self.filter(
             Q(merged_id="") | Q(merged_id=None),
@@ -51,7 +181,7 @@ class HumanManager(Manager):
             ),
         )
 
-        return list(hs.values(
+        return hs.values(
             'id',
             'first_name',
             'middle_name',
@@ -72,11 +202,25 @@ class HumanManager(Manager):
             'is_expelled',
             'status',
             'current_through',
-        ))
+        )
 
 
 class StructureManager(Manager):
+    export_keys = ['id']
+
     def export_values(self, cursor=None, pk=None):
+        return list(self.get_export_queryset(cursor=cursor, pk=pk))
+
+    def export_pages(self, cursor=None, size=1000, bounds=None):
+        return paginate(within(self.get_export_queryset(cursor=cursor), bounds), self.export_keys, size)
+
+    def export_ids(self, size=5000):
+        return stream(self.get_export_queryset(), self.export_keys, size)
+
+    def get_high_water_mark(self):
+        return self.aggregate(modified=Max('modified'))['modified']
+
+    def get_export_queryset(self, cursor=None, pk=None):
         active_status = [
             'active',
             'active-internal',
@@ -119,7 +263,7 @@ class StructureManager(Manager):
             )
         )
 
-        return list(ss.values(
+        return ss.values(
             'id',
             'name',
             'kind',
@@ -143,11 +287,34 @@ class StructureManager(Manager):
             'established_date',
             'district',
             'status_real',
-        ))
+        )
 
 
 class RoleManager(Manager):
+    export_keys = ['structure_id', 'human_id', 'name']
+
     def export_values(self, cursor=None):
+        return list(self.get_export_queryset(cursor=cursor))
+
+    def export_pages(self, cursor=None, size=1000, bounds=None):
+        # Keyset paging can't step over a NULL key; roles without a human
+        # can't be synced anyway.
+        rs = self.get_export_queryset(cursor=cursor).filter(
+            human__isnull=False,
+        )
+        return paginate(within(rs, bounds), self.export_keys, size)
+
+    def export_ids(self, size=5000):
+        # Officers are keyed on the (structure, human) pair alone.
+        rs = self.get_export_queryset().filter(
+            human__isnull=False,
+        )
+        return stream(rs, ['structure_id', 'human_id'], size)
+
+    def get_high_water_mark(self):
+        return self.aggregate(modified=Max('modified'))['modified']
+
+    def get_export_queryset(self, cursor=None):
         today = date.today()
         rs = self.filter(
             Q(structure__deleted_by="") | Q(structure__deleted_by=None),
@@ -158,7 +325,7 @@ class RoleManager(Manager):
             rs = rs.filter(
                 modified__gte=cursor,
             )
-        return list(rs.values(
+        return rs.values(
             'name',
             'human_id',
             'structure_id',
@@ -172,11 +339,172 @@ class RoleManager(Manager):
                 default=-10,
                 output_field=IntegerField(),
             ),
-        ))
+        )
 
 
 class JoinManager(Manager):
+    export_keys = ['structure__id', 'subscription__human__id']
+
     def export_values(self, cursor=None):
+        return list(self.get_export_queryset(cursor=cursor))
+
+    def export_pages(self, cursor=None, size=1000, bounds=None):
+        # The grouped export query is far too slow to re-run per page.
+        return chunks(self.export_reduced(cursor=cursor, bounds=bounds), size)
+
+    def export_ids(self, size=5000):
+        # The pairs with an eligible join, which are the rows of the
+        # grouped export, sorted by the database once and streamed.
+        pairs = self.filter(
+            self.get_eligible(),
+        ).values(
+            *self.export_keys
+        ).distinct().order_by(*self.export_keys)
+        for row in stream_values(pairs, size):
+            yield tuple(row[key] for key in self.export_keys)
+
+    def get_eligible(self):
+        """Match the joins that count towards a membership."""
+        return Q(
+            Q(paid=True),
+            Q(deleted__isnull=True),
+            Q(membership__deleted_by="") | Q(membership__deleted_by=None),
+            Q(subscription__deleted=None),
+            Q(structure__deleted_by="") | Q(structure__deleted_by=None),
+            Q(subscription__human__merged_id="") | Q(subscription__human__merged_id=None),
+            Q(subscription__human__deleted_by="") | Q(subscription__human__deleted_by=None),
+        )
+
+    def export_reduced(self, cursor=None, after=None, size=5000, bounds=None):
+        """Yield the same rows as `export_values`, in linear time.
+
+        Rather than three correlated subqueries per (structure, human)
+        pair, every join is read once, from a single query sorted on the
+        pair and streamed through a server-side cursor, and each pair is
+        reduced in Python as its rows go by.  As with the subqueries,
+        vocal part and end dates consider all of a pair's joins, while
+        the id and start date consider only the eligible ones.
+
+        Passing the last `(structure_id, human_id)` handled as `after`
+        resumes the stream just past that pair, and `bounds` restricts it
+        as in `within`.
+
+        Given a `cursor`, the changed pairs are found first, and only
+        their joins are read, a chunk of `size` pairs at a time, so an
+        incremental export scales with the number of changes.
+        """
+        eligible = self.get_eligible()
+        if cursor:
+            changed = Q(
+                Q(modified__gte=cursor) |
+                Q(membership__modified__gte=cursor) |
+                Q(subscription__modified__gte=cursor)
+            )
+        else:
+            changed = Q()
+        js = self.annotate(
+            is_eligible=Case(
+                When(eligible, then=Value(True)),
+                default=Value(False),
+                output_field=BooleanField(),
+            ),
+            is_changed=Case(
+                When(eligible & changed, then=Value(True)),
+                default=Value(False),
+                output_field=BooleanField(),
+            ),
+        ).values(
+            'structure__id',
+            'subscription__human__id',
+            'id',
+            'part',
+            'modified',
+            'inactive_date',
+            'subscription__current_through',
+            'established_date',
+            'structure__kind',
+            'is_eligible',
+            'is_changed',
+        )
+        if after:
+            js = js.filter(keyset(self.export_keys, after))
+        js = within(js, bounds).order_by(*self.export_keys, 'id')
+        today = date.today()
+        if not cursor:
+            yield from self.reduce_stream(stream_values(js, size), today)
+            return
+        pairs = within(self.filter(eligible & changed), bounds)
+        if after:
+            pairs = pairs.filter(keyset(self.export_keys, after))
+        pairs = sorted(set(pairs.values_list(*self.export_keys)))
+        for chunk in chunks(pairs, size):
+            rows = js.filter(
+                structure__id__in={structure_id for structure_id, _ in chunk},
+                subscription__human__id__in={human_id for _, human_id in chunk},
+            )
+            yield from self.reduce_stream(stream_values(rows, size), today, set(chunk))
+
+    def reduce_stream(self, rows, today, pairs=None):
+        """Reduce a stream of joins sorted on the pair, one pair at a time.
+
+        If given, only the pairs in `pairs` are reduced.
+        """
+        grouped = groupby(
+            rows,
+            key=lambda row: (row['structure__id'], row['subscription__human__id']),
+        )
+        for pair, joins in grouped:
+            if pairs is not None and pair not in pairs:
+                continue
+            join = self.reduce_joins(list(joins), today)
+            if join:
+                yield join
+
+    def reduce_joins(self, rows, today):
+        """Collapse the sorted joins of one (structure, human) pair."""
+        eligible = [row for row in rows if row['is_eligible']]
+        if not eligible or not any(row['is_changed'] for row in rows):
+            return None
+        # Latest modified wins; ties keep the first row seen.
+        dated = [row for row in rows if row['modified']]
+        if dated:
+            vocal_part = max(dated, key=lambda row: row['modified'])['part']
+        else:
+            vocal_part = rows[0]['part']
+        # Most recent date, where any open-ended (NULL) date wins.
+        inactives = [row['inactive_date'] for row in rows]
+        inactivist_date = None if None in inactives else max(inactives)
+        currents = [row['subscription__current_through'] for row in rows]
+        currentest_date = None if None in currents else max(currents)
+        starts = [row['established_date'] for row in eligible if row['established_date']]
+        if rows[0]['structure__kind'] in ['chorus', 'chapter']:
+            endest_date = inactivist_date
+        else:
+            endest_date = currentest_date
+        if endest_date is None or endest_date >= today:
+            status = 10
+        else:
+            status = -10
+        return {
+            'structure__id': rows[0]['structure__id'],
+            'subscription__human__id': rows[0]['subscription__human__id'],
+            'id': max(row['id'] for row in eligible),
+            'vocal_part': vocal_part,
+            'startest_date': min(starts) if starts else None,
+            'endest_date': endest_date,
+            'status': status,
+        }
+
+    def get_high_water_mark(self):
+        Membership = apps.get_model('source.membership')
+        Subscription = apps.get_model('source.subscription')
+        return latest(
+            self.aggregate(modified=Max('modified'))['modified'],
+            Membership.objects.aggregate(modified=Max('modified'))['modified'],
+            Subscription.objects.aggregate(modified=Max('modified'))['modified'],
+        )
+
+    def get_export_queryset(self, cursor=None):
         today = date.today()
         js = self.select_related(
             'structure',
@@ -260,4 +588,4 @@ class JoinManager(Manager):
             'endest_date',
             'status',
         )
-        return list(js)
+        return js